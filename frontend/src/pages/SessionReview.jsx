@@ -35,7 +35,7 @@ export default function SessionReview() {
     setLoading(true);
     try {
       const [tl, vd, hs, ins, ch, ev] = await Promise.all([
-        fetch(`${API}/v1/sessions/${sid}/timeline`).then(r => r.json()),
+        fetch(`${API}/v1/sessions/${sid}/timeline?max_points=1500`).then(r => r.json()),
         fetch(`${API}/v1/sessions/${sid}/verdicts`).then(r => r.json()),
         fetch(`${API}/v1/sessions/${sid}/health-score`).then(r => r.json()),
         fetch(`${API}/v1/sessions/${sid}/insights`).then(r => r.json()),
@@ -330,8 +330,8 @@ def _build_gemini_prompt(
     """Constructs the structured prompt sent to Gemini for each chunk."""
     state_desc = "\n".join(
         f"  - {s.name}: intended_emotion={s.intended_emotion}, "
-        f"visual_cues={s.visual_cues}, "
-        f"failure_indicators={s.failure_indicators}"
+        f"visual_cues={list(s.visual_cues)}, "
+        f"failure_indicators={list(s.failure_indicators)}"
         for s in dfa_config.states
     )
     valid_state_names = [s.name for s in dfa_config.states]
@@ -9,6 +9,7 @@ Set MOCK_MODE = False when you're ready to go live with real Gemini calls.
 from __future__ import annotations
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -46,6 +47,10 @@ VECTORAI_COLLECTION: str = os.getenv("VECTORAI_COLLECTION", "PatchLab_embeddings
 CHUNK_DURATION_SEC: float = float(os.getenv("CHUNK_DURATION_SEC", "10"))
 FUSION_RESAMPLE_HZ: int = int(os.getenv("FUSION_RESAMPLE_HZ", "1"))
 EMBEDDING_WINDOW_SEC: int = int(os.getenv("EMBEDDING_WINDOW_SEC", "10"))
+# Where per-session memory-mapped stream buffers live
+SESSION_SPILL_DIR: str = os.getenv(
+    "SESSION_SPILL_DIR", os.path.join(tempfile.gettempdir(), "patchlab_sessions")
+)
 
 # ── Verdict thresholds ────────────────────────────────────────────────────────
 WARN_DELTA_THRESHOLD: float = 0.25   # delta >= this -> FAIL, else WARN
@@ -19,19 +19,22 @@ Public API (called by main.py and snowflake_writer.py):
                  session_id) -> pd.DataFrame
 
     fuse_timeline(...)  # legacy-compatible wrapper kept for existing backend calls
+
+    downsample_rows(rows, max_points) -> List[dict]  # LTTB thinning for chart payloads
 """
 
 from __future__ import annotations
 
 import logging
 import math
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
 from config import FUSION_RESAMPLE_HZ
-from models import ChunkResult, DFAConfig, EmotionFrame, FusedRow, WatchReading
+from models import EMOTION_KEYS, ChunkResult, DFAConfig, EmotionFrame, FusedRow, WatchReading
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +57,12 @@ EMOTION_COLUMN_MAP: Dict[str, str] = {
     "scared":      "surprise",
 }
 
-EMOTION_COLS = ["frustration", "confusion", "delight", "boredom", "surprise", "engagement"]
+EMOTION_COLS = list(EMOTION_KEYS)  # frustration, confusion, delight, boredom, surprise, engagement
+EMOTION_INDEX: Dict[str, int] = {c: i for i, c in enumerate(EMOTION_COLS)}
+_DOMINANT_COLS = EMOTION_COLS[:5]       # engagement is not a candidate for dominant_emotion
+_DOMINANT_LABELS = np.array(_DOMINANT_COLS + ["unknown"], dtype=object)
+_PRESAGE_COLS = ["t_sec"] + EMOTION_COLS + ["presage_hr", "breathing_rate"]
+_WATCH_COLS = ["hr", "hrv_rmssd", "hrv_sdnn", "movement_variance"]
 
 
 
@@ -66,7 +74,7 @@ EMOTION_COLS = ["frustration", "confusion", "delight", "boredom", "surprise", "e
 def _normalize_presage(frames: List[Any]) -> pd.DataFrame:
     """
     Accept Presage data in any of three formats:
-      1. List[EmotionFrame] Pydantic objects  (from models.py)
+      1. List[EmotionFrame] msgspec Structs   (from models.py)
       2. List[dict] with 'timestamp_sec' key  (from backend API)
       3. List[dict] with 'timestamp' key      (from spec / raw SDK)
 
@@ -74,40 +82,28 @@ def _normalize_presage(frames: List[Any]) -> pd.DataFrame:
     delight, boredom, surprise, engagement, presage_hr, breathing_rate]
     """
     if not frames:
-        return pd.DataFrame(columns=["t_sec"] + EMOTION_COLS + ["presage_hr", "breathing_rate"])
+        return pd.DataFrame(columns=_PRESAGE_COLS)
 
-    rows = []
-    for f in frames:
+    # Pack straight into an (N, K) float matrix — no per-frame dict allocation
+    matrix = np.empty((len(frames), len(_PRESAGE_COLS)), dtype=np.float64)
+    for i, f in enumerate(frames):
         if isinstance(f, EmotionFrame):
-            ts = f.timestamp_sec
-            row = {
-                "t_sec":        ts,
-                "frustration":  f.frustration,
-                "confusion":    f.confusion,
-                "delight":      f.delight,
-                "boredom":      f.boredom,
-                "surprise":     f.surprise,
-                "engagement":   f.engagement,
-                "presage_hr":   f.heart_rate,
-                "breathing_rate": f.breathing_rate,
-            }
+            matrix[i] = (
+                f.timestamp_sec,
+                f.frustration, f.confusion, f.delight, f.boredom, f.surprise, f.engagement,
+                f.heart_rate, f.breathing_rate,
+            )
         else:
             # Dict — handle both key names
-            ts = float(f.get("timestamp_sec", f.get("timestamp", 0.0)))
-            row = {
-                "t_sec":        ts,
-                "frustration":  float(f.get("frustration", 0.0)),
-                "confusion":    float(f.get("confusion", 0.0)),
-                "delight":      float(f.get("delight", 0.0)),
-                "boredom":      float(f.get("boredom", 0.0)),
-                "surprise":     float(f.get("surprise", 0.0)),
-                "engagement":   float(f.get("engagement", 0.0)),
-                "presage_hr":   float(f.get("heart_rate", f.get("hr", 0.0))),
-                "breathing_rate": float(f.get("breathing_rate", 0.0)),
-            }
-        rows.append(row)
+            get = f.get
+            matrix[i] = (
+                float(get("timestamp_sec", get("timestamp", 0.0))),
+                *(float(get(c, 0.0)) for c in EMOTION_COLS),
+                float(get("heart_rate", get("hr", 0.0))),
+                float(get("breathing_rate", 0.0)),
+            )
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(matrix, columns=_PRESAGE_COLS)
 
 
 def _normalize_watch(readings: List[Any]) -> pd.DataFrame:
@@ -116,8 +112,19 @@ def _normalize_watch(readings: List[Any]) -> pd.DataFrame:
     Handles 'timestamp_sec' and 'timestamp' keys. Also handles
     the spec's 'hrv' key mapped to hrv_rmssd.
 
+    Also accepts the numpy structured array from session_buffers.WatchBuffer.
+
     Returns DataFrame: [t_sec, hr, hrv_rmssd, hrv_sdnn, movement_variance]
     """
+    if isinstance(readings, np.ndarray):
+        return pd.DataFrame({
+            "t_sec":             readings["timestamp_sec"].astype(np.float64),
+            "hr":                readings["heart_rate"].astype(np.float64),
+            "hrv_rmssd":         readings["hrv_rmssd"].astype(np.float64),
+            "hrv_sdnn":          readings["hrv_sdnn"].astype(np.float64),
+            "movement_variance": readings["movement_variance"].astype(np.float64),
+        })
+
     if not readings:
         return pd.DataFrame(columns=["t_sec", "hr", "hrv_rmssd", "hrv_sdnn", "movement_variance"])
 
@@ -173,16 +180,20 @@ def _build_state_timeline(
 
     transitions.sort(key=lambda x: x["t"])
 
-    # Build a full-length index and forward-fill
-    index = pd.RangeIndex(total_sec)
-    state_series = pd.Series("unknown", index=index, dtype=str, name="state")
-
-    for tr in transitions:
-        t_int = int(tr["t"])
-        if 0 <= t_int < total_sec:
-            state_series.iloc[t_int:] = tr["state"]
+    # Forward-fill: for every second, pick the last transition whose second <= t.
+    # t_ints is non-decreasing after the sort, so one searchsorted aligns all seconds.
+    t_ints = np.fromiter((int(tr["t"]) for tr in transitions), dtype=np.int64, count=len(transitions))
+    in_range = (t_ints >= 0) & (t_ints < total_sec)
+    t_ints = t_ints[in_range]
+    labels = np.array(
+        ["unknown"] + [tr["state"] for tr, keep in zip(transitions, in_range) if keep],
+        dtype=object,
+    )
+    # side="right" makes the latest transition within the same second win
+    idx = np.searchsorted(t_ints, np.arange(total_sec), side="right")
 
-    return state_series
+    index = pd.RangeIndex(total_sec)
+    return pd.Series(labels[idx], index=index, dtype=str, name="state")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -212,15 +223,18 @@ def _compute_intent_delta(
         state_intent[s.name] = (col, s.acceptable_range[0] + (s.acceptable_range[1] - s.acceptable_range[0]) / 2)
         # Use midpoint of acceptable range as the intended score target
 
-    deltas = []
-    for _, row in df.iterrows():
-        state = row.get("state", "unknown")
-        if state in state_intent:
-            col, intended_score = state_intent[state]
-            actual = row.get(col, 0.0)
-            deltas.append(abs(actual - intended_score))
-        else:
-            deltas.append(np.nan)
+    # Intern state names to int codes once; each DFA state is then an integer mask
+    states = df["state"].to_numpy() if "state" in df.columns else np.full(len(df), "unknown", dtype=object)
+    state_codes, state_labels = pd.factorize(states)
+    code_of = {name: i for i, name in enumerate(state_labels)}
+    emotions = df.reindex(columns=EMOTION_COLS, fill_value=0.0).to_numpy(dtype=np.float64)
+    deltas = np.zeros(len(df), dtype=np.float64)
+    for state, (col, intended_score) in state_intent.items():
+        code = code_of.get(state)
+        if code is None:
+            continue
+        mask = state_codes == code
+        deltas[mask] = np.abs(emotions[mask, EMOTION_INDEX[col]] - intended_score)
 
     return pd.Series(deltas, index=df.index).fillna(0.0)
 
@@ -283,16 +297,13 @@ def fuse_streams(
 
     # ── Step 3: Resample Presage to 1 Hz by averaging within each second ──
     if not presage_df.empty:
-        presage_df["t_bucket"] = presage_df["t_sec"].astype(int).clip(0, total_sec - 1)
-        presage_1hz = (
-            presage_df
-            .drop(columns=["t_sec"])
-            .groupby("t_bucket")
-            .mean()
-            .reindex(index_1hz)
-        )
+        buckets = presage_df["t_sec"].to_numpy().astype(np.int64).clip(0, total_sec - 1)
+        counts = np.bincount(buckets, minlength=total_sec)
+        # Means go through groupby (compensated float64 summation) rather than bincount
+        # sums, so the 1 Hz scores and the verdicts built on them don't drift
+        presage_1hz = presage_df[_PRESAGE_COLS[1:]].groupby(buckets).mean().reindex(index_1hz)
         # Mark data quality: 1.0 if data present, 0.0 if gap
-        data_quality = presage_df.groupby("t_bucket")["frustration"].count().reindex(index_1hz).gt(0).astype(float)
+        data_quality = pd.Series((counts > 0).astype(float), index=index_1hz)
         # Linearly interpolate short gaps (≤ 3s), forward/back-fill edges
         presage_1hz = presage_1hz.interpolate(method="linear", limit=3).ffill().bfill().fillna(0.0)
     else:
@@ -308,23 +319,27 @@ def fuse_streams(
 
     # ── Step 4: Resample Watch to 1 Hz via forward-fill ───────────────────
     if not watch_df.empty:
-        watch_df["t_bucket"] = watch_df["t_sec"].astype(int).clip(0, total_sec - 1)
-        watch_1hz = (
-            watch_df
-            .drop(columns=["t_sec"])
-            .groupby("t_bucket")
-            .last()           # keep last reading in each second
-            .reindex(index_1hz)
-            .ffill()          # forward-fill gaps (Watch may drop out temporarily)
-            .bfill()          # back-fill leading NaNs
-            .fillna(0.0)
+        buckets = watch_df["t_sec"].to_numpy().astype(np.int64).clip(0, total_sec - 1)
+        # Keep the last reading in each second: first hit of each bucket in reverse arrival order
+        seen, first_rev = np.unique(buckets[::-1], return_index=True)
+        last_row = np.full(total_sec, -1, dtype=np.int64)
+        last_row[seen] = len(buckets) - 1 - first_rev
+        # Forward-fill gaps (Watch may drop out temporarily), then back-fill leading seconds,
+        # by carrying the source second forward and gathering once
+        src = np.where(last_row >= 0, np.arange(total_sec), -1)
+        src = np.maximum.accumulate(src)
+        src[src < 0] = seen[0]
+        watch_1hz = pd.DataFrame(
+            watch_df[_WATCH_COLS].to_numpy(dtype=np.float64)[last_row[src]],
+            index=index_1hz,
+            columns=_WATCH_COLS,
         )
     else:
         logger.warning("[fusion] No Watch data — filling HR/HRV columns with 0")
         watch_1hz = pd.DataFrame(
             0.0,
             index=index_1hz,
-            columns=["hr", "hrv_rmssd", "hrv_sdnn", "movement_variance"],
+            columns=_WATCH_COLS,
         )
 
     # ── Step 5: Forward-fill DFA state from Gemini chunk results ──────────
@@ -352,14 +367,21 @@ def fuse_streams(
     fused["data_quality"] = data_quality.values
 
     # ── Step 7: Derived columns ────────────────────────────────────────────
-    # time_in_state_sec: how many consecutive seconds in the current state
-    state_change = fused["state"] != fused["state"].shift(1)
-    group_ids = state_change.cumsum()
-    fused["time_in_state_sec"] = fused.groupby(group_ids).cumcount()
+    # time_in_state_sec: how many consecutive seconds in the current state,
+    # computed on interned int state codes rather than string comparisons
+    state_codes, _ = pd.factorize(fused["state"])
+    state_change = np.empty(len(state_codes), dtype=bool)
+    state_change[:1] = True
+    state_change[1:] = state_codes[1:] != state_codes[:-1]
+    run_starts = np.flatnonzero(state_change)
+    run_ids = np.cumsum(state_change) - 1
+    fused["time_in_state_sec"] = np.arange(len(state_codes)) - run_starts[run_ids]
 
     # dominant_emotion: which emotion channel is highest at each second
-    emotion_vals = fused[["frustration", "confusion", "delight", "boredom", "surprise"]]
-    fused["dominant_emotion"] = emotion_vals.idxmax(axis=1).where(emotion_vals.max(axis=1) > 0, "unknown")
+    emotion_vals = fused[_DOMINANT_COLS].to_numpy(dtype=np.float64)
+    dominant_idx = emotion_vals.argmax(axis=1)
+    dominant_idx[emotion_vals.max(axis=1) <= 0] = len(_DOMINANT_COLS)
+    fused["dominant_emotion"] = _DOMINANT_LABELS[dominant_idx]
 
     # intent_delta: |actual - intended| for the current state's target emotion
     fused["intent_delta"] = _compute_intent_delta(fused, dfa_config)
@@ -459,3 +481,63 @@ def fuse_timeline(
         ))
 
     return rows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Chart downsampling
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Series the dashboard plots from a fused row
+_CHART_COLS = EMOTION_COLS + ["watch_hr", "presage_hr"]
+_CHART_GETTER = itemgetter(*_CHART_COLS)
+
+
+def lttb_indices(x: np.ndarray, ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pick n_out row indices that preserve the
+    visual shape of the series.
+
+    ys is (N, K); the triangle area is summed across all K series so a single
+    shared set of rows keeps the peaks of every line. The first and last rows
+    are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed endpoints
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Third vertex: centroid of the next bucket (the last row for the final bucket)
+        nhi = edges[b + 2] if b + 2 < len(edges) else n
+        cx = x[hi:nhi].mean()
+        cy = ys[hi:nhi].mean(axis=0)
+        area = np.abs(
+            (x[a] - cx) * (ys[lo:hi] - ys[a]) - (x[a] - x[lo:hi, None]) * (cy - ys[a])
+        ).sum(axis=1)
+        a = lo + int(area.argmax())
+        out[b + 1] = a
+    return out
+
+
+def downsample_rows(rows: List[Dict[str, Any]], max_points: int) -> List[Dict[str, Any]]:
+    """Thin fused timeline rows to at most max_points for plotting (rows are not copied)."""
+    if len(rows) <= max_points:
+        return rows
+    x = np.fromiter(
+        (r.get("timestamp_sec", i) for i, r in enumerate(rows)), dtype=np.float64, count=len(rows),
+    )
+    try:
+        # Fused rows carry every column: one C-level itemgetter call per row
+        ys = np.array(list(map(_CHART_GETTER, rows)), dtype=np.float64)
+    except KeyError:
+        ys = np.array([[r.get(c) for c in _CHART_COLS] for r in rows], dtype=np.float64)
+    ys = np.nan_to_num(ys)  # None → NaN → 0
+    # Put HR (bpm) and emotions (0-1) on the same footing before comparing areas
+    span = np.ptp(ys, axis=0)
+    ys = (ys - ys.min(axis=0)) / np.where(span > 0, span, 1.0)
+    return [rows[i] for i in lttb_indices(x, ys, max_points)]
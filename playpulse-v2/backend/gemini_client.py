@@ -7,12 +7,16 @@ Gemini client — wraps Google's Gemini API for:
   4. generate_cross_tester_insights() — aggregate comparison (gemini-2.5-flash)
 
 Uses different models per task for cost/quality tradeoff.
+Concurrent identical insight prompts share one in-flight generate_content
+call (_InsightSingleFlight); every SDK call runs in a worker thread with
+jittered exponential backoff on 429 / 5xx.
 STUB — returns plausible mock data so the rest of the pipeline runs
 without a real API key. When GEMINI_API_KEY is set, calls the real API.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import random
@@ -28,6 +32,62 @@ MODEL_INSIGHT_GENERATION = "gemini-2.5-flash"    # post-session insight generati
 # ── Video frame sampling ──────────────────────────────────────
 CHUNK_FPS = int(os.getenv("CHUNK_FPS", "2"))     # 2 FPS default → 30 frames per 15s chunk
 
+# ── Retry ─────────────────────────────────────────────────────
+RETRY_MAX = 3
+RETRY_BASE_SEC = 1.0
+RETRY_JITTER_SEC = 0.5
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """429 and 5xx from the Gemini API are worth retrying; everything else is not."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return isinstance(code, int) and (code == 429 or code >= 500)
+
+
+async def _with_backoff(fn, *args, **kwargs):
+    """Run a blocking SDK call off the event loop, retrying 429/5xx with jittered backoff."""
+    for attempt in range(RETRY_MAX + 1):
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        except Exception as e:
+            if attempt == RETRY_MAX or not _is_retryable(e):
+                raise
+            delay = RETRY_BASE_SEC * (2 ** attempt) + random.uniform(0, RETRY_JITTER_SEC)
+            print(f"[gemini] {e} — retry {attempt + 1}/{RETRY_MAX} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+class _InsightSingleFlight:
+    """Shares one in-flight generate_content call among callers sending an identical prompt.
+
+    e.g. several dashboard tabs asking for the same project's cross-tester
+    insights at once make a single model call instead of one each.
+    """
+
+    def __init__(self, client: Any, model: str):
+        self._client = client
+        self._model = model
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def submit(self, prompt: str) -> str:
+        fut = self._inflight.get(prompt)
+        if fut is None:
+            fut = asyncio.ensure_future(self._generate(prompt))
+            self._inflight[prompt] = fut
+            fut.add_done_callback(lambda f: self._forget(prompt, f))
+        # shield: one caller being cancelled must not cancel the call the others wait on
+        return await asyncio.shield(fut)
+
+    def _forget(self, prompt: str, fut: asyncio.Future) -> None:
+        if self._inflight.get(prompt) is fut:
+            del self._inflight[prompt]
+
+    async def _generate(self, prompt: str) -> str:
+        response = await _with_backoff(
+            self._client.models.generate_content, model=self._model, contents=prompt,
+        )
+        return response.text
+
 
 class GeminiClient:
     """Google Gemini multimodal API client.
@@ -38,10 +98,12 @@ class GeminiClient:
     def __init__(self, api_key: str = ""):
         self.api_key = api_key or GEMINI_API_KEY
         self._client = None
+        self._insights: Optional[_InsightSingleFlight] = None
         if self.api_key:
             try:
                 from google import genai
                 self._client = genai.Client(api_key=self.api_key)
+                self._insights = _InsightSingleFlight(self._client, MODEL_INSIGHT_GENERATION)
             except ImportError:
                 pass
 
@@ -124,11 +186,7 @@ class GeminiClient:
                 "4. What's working well"
             )
             try:
-                response = self._client.models.generate_content(
-                    model=MODEL_INSIGHT_GENERATION,
-                    contents=prompt,
-                )
-                return response.text
+                return await self._insights.submit(prompt)
             except Exception as e:
                 print(f"[gemini] Insights error: {e}, falling back to stub")
 
@@ -154,11 +212,7 @@ class GeminiClient:
                 "4. Actionable design recommendations"
             )
             try:
-                response = self._client.models.generate_content(
-                    model=MODEL_INSIGHT_GENERATION,
-                    contents=prompt,
-                )
-                return response.text
+                return await self._insights.submit(prompt)
             except Exception as e:
                 print(f"[gemini] Cross-tester insights error: {e}, falling back to stub")
 
@@ -169,9 +223,7 @@ class GeminiClient:
         self, model: str, video_bytes: bytes, prompt: str, fps: int = 2
     ) -> Dict:
         """Upload video bytes and call Gemini with prompt."""
-        import io
         import tempfile
-        import time as sync_time
 
         # Write video to temp file for upload
         with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
@@ -179,18 +231,19 @@ class GeminiClient:
             tmp_path = tmp.name
 
         try:
-            video_file = self._client.files.upload(file=tmp_path)
+            video_file = await _with_backoff(self._client.files.upload, file=tmp_path)
 
             # Wait for file to be ACTIVE (required for video processing)
             print(f"[gemini] Uploaded file {video_file.name}, waiting for ACTIVE state...")
             while video_file.state.name != "ACTIVE":
-                sync_time.sleep(1)
-                video_file = self._client.files.get(name=video_file.name)
+                await asyncio.sleep(1)
+                video_file = await _with_backoff(self._client.files.get, name=video_file.name)
                 if video_file.state.name == "FAILED":
                     raise Exception(f"Video file processing failed: {video_file.name}")
             print(f"[gemini] File {video_file.name} is ACTIVE, generating content...")
 
-            response = self._client.models.generate_content(
+            response = await _with_backoff(
+                self._client.models.generate_content,
                 model=model,
                 contents=[
                     video_file,
@@ -207,7 +260,7 @@ class GeminiClient:
             
             # Clean up uploaded file from Gemini servers
             try:
-                self._client.files.delete(name=video_file.name)
+                await asyncio.to_thread(self._client.files.delete, name=video_file.name)
                 print(f"[gemini] Deleted file {video_file.name} from Gemini servers")
             except Exception as cleanup_err:
                 print(f"[gemini] Could not delete file {video_file.name}: {cleanup_err}")
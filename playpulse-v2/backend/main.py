@@ -12,11 +12,17 @@ import logging
 import os
 import uuid
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+import msgpack
+import msgspec
+import orjson
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from models import (
     DFAConfig,
@@ -30,10 +36,11 @@ from models import (
     FusedRow,
     StateVerdict,
 )
-from fusion import fuse_timeline
-from verdict import compute_verdict, compute_playtest_health_score
+from fusion import downsample_rows, fuse_timeline
+from verdict import compute_verdict, compute_playtest_health_score, group_rows_by_state
 from embedding import generate_window_embedding
 from chunk_processor import process_chunk as cp_process_chunk, stitch_chunk_results
+from session_buffers import SessionBuffers, WatchBuffer
 
 from presage_client import PresageClient
 from gemini_client import GeminiClient
@@ -56,17 +63,30 @@ projects: Dict[str, Dict] = {}
 sessions: Dict[str, Dict] = {}
 session_chunks: Dict[str, Dict[int, bytes]] = {}   # session_id → {chunk_index: bytes}
 chunk_results: Dict[str, Dict[int, ChunkResult]] = {}
-session_watch_data: Dict[str, List[Dict]] = {}
+session_watch_data: Dict[str, WatchBuffer] = {}     # memory-mapped, see session_buffers.py
 session_face_video: Dict[str, bytes] = {}
 session_fused: Dict[str, List[Dict]] = {}
 session_verdicts: Dict[str, List[Dict]] = {}
 session_health: Dict[str, float] = {}
 session_insights: Dict[str, str] = {}
 session_events: Dict[str, List[Dict]] = {}
-session_emotion_frames: Dict[str, List[Dict]] = {}  # desktop client emotion data
+session_emotion_frames: Dict[str, SessionBuffers] = {}  # desktop client emotion data (SoA)
+chunk_ready: Dict[str, Dict[int, asyncio.Event]] = {}  # session_id → {chunk_index: set when processed}
+project_versions: Dict[str, int] = {}                  # project_id → bumped whenever a session completes
+aggregate_insights_cache: Dict[str, tuple] = {}        # project_id → (version, payload)
+timeline_json_cache: Dict[str, OrderedDict[Optional[int], bytes]] = {}  # session_id → LRU {max_points: encoded body}
+TIMELINE_CACHE_VARIANTS = 8  # distinct max_points bodies kept per session
 
 # ── FastAPI app ──────────────────────────────────────────────
-app = FastAPI(title="PatchLab", version="2.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Delete the memmap spill files of sessions that were never finalized
+    for buf in session_watch_data.values():
+        buf.close()
+
+
+app = FastAPI(title="PatchLab", version="2.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -93,8 +113,11 @@ class CreateSessionReq(BaseModel):
     tester_name: str = "anonymous"
     chunk_duration_sec: float = 15.0   # configurable; demo override = 10
 
-class EmotionFrameBatchReq(BaseModel):
-    frames: List[Dict] = []
+class EmotionFrameBatchReq(msgspec.Struct):
+    frames: List[Dict[str, Any]] = []
+
+# Decoded straight from the request bytes — this is the highest-rate endpoint
+_emotion_batch_decoder = msgspec.json.Decoder(EmotionFrameBatchReq)
 
 class WatchDataReq(BaseModel):
     timestamp_sec: float = 0.0
@@ -116,6 +139,27 @@ class VectorSearchReq(BaseModel):
 #   PROJECT ENDPOINTS
 # ────────────────────────────────────────────────────────────
 
+# Built once at import so the serializer isn't rebuilt on the first hot request
+_dfa_config_adapter = TypeAdapter(DFAConfig)
+
+
+def _build_dfa_config(states: List[Dict], transitions: List[Dict]) -> DFAConfig:
+    """Validate raw DFA dicts from a request body, filling in the API defaults."""
+    raw = {
+        "states": [
+            {
+                "name": "unnamed", "intended_emotion": "delight",
+                "acceptable_range": [0.3, 0.7], "expected_duration_sec": 30, **s,
+            }
+            for s in states
+        ],
+        "transitions": [{"from_state": "", "to_state": "", **t} for t in transitions],
+    }
+    try:
+        return _dfa_config_adapter.validate_python(raw)
+    except ValidationError as exc:
+        raise HTTPException(422, exc.errors(include_url=False, include_context=False))
+
 @app.get("/v1/projects")
 async def list_projects():
     """List all projects (debug/discovery)."""
@@ -138,6 +182,9 @@ async def list_sessions():
 async def delete_project_data(project_id: str):
     """Delete all Snowflake data for a given project_id."""
     deleted = await snowflake.delete_project_data(project_id)
+    for sid, s in sessions.items():
+        if s["project_id"] == project_id and sid in session_watch_data:
+            session_watch_data[sid].close()
     return {"project_id": project_id, "deleted": deleted}
 
 
@@ -145,32 +192,14 @@ async def delete_project_data(project_id: str):
 async def create_project(body: CreateProjectReq):
     pid = str(uuid.uuid4())[:8]
     api_key = f"pp_{uuid.uuid4().hex[:16]}"
-    dfa_states = []
-    for s in body.dfa_states:
-        dfa_states.append(DFAState(
-            name=s.get("name", "unnamed"),
-            description=s.get("description", ""),
-            intended_emotion=s.get("intended_emotion", "delight"),
-            acceptable_range=tuple(s.get("acceptable_range", [0.3, 0.7])),
-            expected_duration_sec=s.get("expected_duration_sec", 30),
-            visual_cues=s.get("visual_cues", []),
-            failure_indicators=s.get("failure_indicators", []),
-            success_indicators=s.get("success_indicators", []),
-        ))
-    transitions = [
-        DFATransitionDef(
-            from_state=t.get("from_state", ""),
-            to_state=t.get("to_state", ""),
-            trigger=t.get("trigger", ""),
-        )
-        for t in body.transitions
-    ]
+    cfg = _build_dfa_config(body.dfa_states, body.transitions)
     projects[pid] = {
         "id": pid,
         "api_key": api_key,
         "name": body.name,
         "description": body.description,
-        "dfa_config": DFAConfig(states=dfa_states, transitions=transitions),
+        "dfa_config": cfg,
+        "dfa_config_dump": _dfa_config_adapter.dump_python(cfg, mode="json"),
         "optimal_reference": None,
         "created_at": time.time(),
     }
@@ -182,30 +211,11 @@ async def get_project(project_id: str):
     p = projects.get(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    cfg = p["dfa_config"]
     return {
         "id": p["id"],
         "name": p["name"],
         "description": p["description"],
-        "dfa_config": {
-            "states": [
-                {
-                    "name": s.name,
-                    "description": s.description,
-                    "intended_emotion": s.intended_emotion,
-                    "acceptable_range": list(s.acceptable_range),
-                    "expected_duration_sec": s.expected_duration_sec,
-                    "visual_cues": s.visual_cues,
-                    "failure_indicators": s.failure_indicators,
-                    "success_indicators": s.success_indicators,
-                }
-                for s in cfg.states
-            ],
-            "transitions": [
-                {"from_state": t.from_state, "to_state": t.to_state, "trigger": t.trigger}
-                for t in cfg.transitions
-            ],
-        },
+        "dfa_config": p["dfa_config_dump"],
         "has_optimal_reference": p["optimal_reference"] is not None,
         "session_count": sum(1 for s in sessions.values() if s["project_id"] == project_id),
     }
@@ -216,27 +226,8 @@ async def update_dfa(project_id: str, body: UpdateDFAReq):
     p = projects.get(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    dfa_states = []
-    for s in body.states:
-        dfa_states.append(DFAState(
-            name=s.get("name", "unnamed"),
-            description=s.get("description", ""),
-            intended_emotion=s.get("intended_emotion", "delight"),
-            acceptable_range=tuple(s.get("acceptable_range", [0.3, 0.7])),
-            expected_duration_sec=s.get("expected_duration_sec", 30),
-            visual_cues=s.get("visual_cues", []),
-            failure_indicators=s.get("failure_indicators", []),
-            success_indicators=s.get("success_indicators", []),
-        ))
-    transitions = [
-        DFATransitionDef(
-            from_state=t.get("from_state", ""),
-            to_state=t.get("to_state", ""),
-            trigger=t.get("trigger", ""),
-        )
-        for t in body.transitions
-    ]
-    p["dfa_config"] = DFAConfig(states=dfa_states, transitions=transitions)
+    p["dfa_config"] = _build_dfa_config(body.states, body.transitions)
+    p["dfa_config_dump"] = _dfa_config_adapter.dump_python(p["dfa_config"], mode="json")
     return {"status": "updated"}
 
 
@@ -282,7 +273,7 @@ async def create_session(project_id: str, body: CreateSessionReq):
     }
     session_chunks[sid] = {}
     chunk_results[sid] = {}
-    session_watch_data[sid] = []
+    session_watch_data[sid] = WatchBuffer(sid)
     session_events[sid] = []
     tester_url = f"/play?session={sid}&project={project_id}"
     return {"session_id": sid, "tester_url": tester_url}
@@ -347,6 +338,18 @@ async def upload_chunk(
     }
 
 
+def _chunk_event(session_id: str, chunk_index: int) -> asyncio.Event:
+    """Get (or lazily create) the event that fires once a chunk has been processed."""
+    return chunk_ready.setdefault(session_id, {}).setdefault(chunk_index, asyncio.Event())
+
+
+def _release_chunk_waiters(session_id: str, chunk_index: int) -> None:
+    """Wake any long-polls for this chunk and drop its event."""
+    ev = chunk_ready.get(session_id, {}).pop(chunk_index, None)
+    if ev is not None:
+        ev.set()
+
+
 async def _process_chunk_bg(session_id: str, chunk_index: int, video_bytes: bytes):
     """Background task: on_chunk_uploaded — run Gemini + write to Snowflake."""
     try:
@@ -376,10 +379,9 @@ async def _process_chunk_bg(session_id: str, chunk_index: int, video_bytes: byte
         chunk_end_sec = (chunk_index + 1) * chunk_dur
         chunk_emotion_frames = []
         if session_id in session_emotion_frames:
-            chunk_emotion_frames = [
-                f for f in session_emotion_frames[session_id]
-                if chunk_index * chunk_dur <= f.get("timestamp_sec", 0.0) < chunk_end_sec
-            ]
+            chunk_emotion_frames = session_emotion_frames[session_id].window(
+                chunk_index * chunk_dur, chunk_end_sec,
+            )
             logger.info(f"[main] Chunk {chunk_index}: found {len(chunk_emotion_frames)} emotion frames for gaze overlay")
         
         result = await cp_process_chunk(
@@ -396,6 +398,7 @@ async def _process_chunk_bg(session_id: str, chunk_index: int, video_bytes: byte
             chunk_results[session_id] = {}
         chunk_results[session_id][chunk_index] = result
         s["chunks_processed"] = len(chunk_results[session_id])
+        _release_chunk_waiters(session_id, chunk_index)
 
         # Write gameplay events to Snowflake bronze layer
         chunk_dur = s.get("chunk_duration_sec", 15.0)
@@ -412,6 +415,7 @@ async def _process_chunk_bg(session_id: str, chunk_index: int, video_bytes: byte
         )
     except Exception as e:
         print(f"[chunk_bg] Error processing chunk {chunk_index} for {session_id}: {e}")
+        _release_chunk_waiters(session_id, chunk_index)
 
 
 @app.post("/v1/sessions/{session_id}/finalize")
@@ -445,32 +449,27 @@ async def finalize_session(session_id: str):
 
     # 2. Presage → emotion frames
     #    Priority: desktop client live frames > face video batch > stub
-    desktop_frames = session_emotion_frames.get(session_id, [])
+    desktop_frames = session_emotion_frames.get(session_id)
     if desktop_frames:
-        # Use live emotion data from desktop client
+        # Use live emotion data from desktop client (columns are already time-sorted
+        # and in EMOTION_KEYS order, so frames are built positionally)
+        desktop_frames.flush()
         emotion_frames = [
-            EmotionFrame(
-                timestamp_sec=f.get("timestamp_sec", 0),
-                frustration=f.get("frustration", 0),
-                confusion=f.get("confusion", 0),
-                delight=f.get("delight", 0),
-                boredom=f.get("boredom", 0),
-                surprise=f.get("surprise", 0),
-                engagement=f.get("engagement", 0),
-            )
-            for f in desktop_frames
+            EmotionFrame(t, *row)
+            for t, row in zip(desktop_frames.ts.tolist(), desktop_frames.scores.tolist())
         ]
     else:
         face_bytes = session_face_video.get(session_id, b"")
         emotion_frames = await presage.analyse_video(face_bytes, session_id)
 
     # 3. Watch data
-    watch_data = session_watch_data.get(session_id, [])
+    watch_buf = session_watch_data.get(session_id)
+    watch_data = watch_buf.view() if watch_buf is not None else []
 
     # Determine duration
     duration = max(
         (max((f.timestamp_sec for f in emotion_frames), default=0)),
-        (max((w.get("timestamp_sec", 0) for w in watch_data), default=0)),
+        (float(watch_data["timestamp_sec"].max()) if len(watch_data) else 0),
         (max((obs["timestamp_sec"] for obs in stitched.get("timeline", [])), default=0) + 15),
         30,
     )
@@ -479,27 +478,29 @@ async def finalize_session(session_id: str):
 
     # 4. Temporal fusion
     fused = fuse_timeline(emotion_frames, dfa_transitions, watch_data, duration)
+    if watch_buf is not None:
+        del watch_data  # release the memmap view so the spill file can be deleted
+        watch_buf.close()
     fused_dicts = [r.__dict__ if hasattr(r, "__dict__") else r for r in fused]
     session_fused[session_id] = fused_dicts
+    timeline_json_cache.pop(session_id, None)
+    for ev in chunk_ready.pop(session_id, {}).values():
+        ev.set()  # no more chunk results after finalize; release any long-polls
 
-    # Store in Snowflake
-    await snowflake.store_fused_rows(session_id, fused_dicts, s["project_id"])
-
-    # 5. Verdicts
+    # 5. Verdicts — bucket the timeline by state once, then score each state
+    rows_by_state = group_rows_by_state(fused)
     verdicts = []
     for state_def in dfa_config.states:
-        v = compute_verdict(fused, state_def)
+        v = compute_verdict(fused, state_def, rows_by_state)
         verdicts.append(v)
     verdict_dicts = [v.__dict__ if hasattr(v, "__dict__") else v for v in verdicts]
     session_verdicts[session_id] = verdict_dicts
-    await snowflake.store_verdicts(session_id, verdict_dicts, s["project_id"])
 
     # 6. Health score
     health = compute_playtest_health_score(verdicts)
     session_health[session_id] = health
-    await snowflake.store_health_score(session_id, health, s["project_id"])
 
-    # 7. Embeddings → VectorAI
+    # 7. Embeddings
     embeddings = []
     for ws in range(0, max(duration - 10, 1), 5):
         emb = generate_window_embedding(
@@ -508,32 +509,84 @@ async def finalize_session(session_id: str):
         )
         if emb:
             embeddings.append(emb)
-    if embeddings:
-        await vectorai.upsert(embeddings)
 
-    # 8. Gemini insights
-    insights = await gemini.generate_session_insights(fused_dicts, verdict_dicts, health)
-    session_insights[session_id] = insights
+    # 8. Fan out the independent sinks together: Snowflake layers, VectorAI, Gemini insights.
+    #    One slow sink no longer holds up the others.
+    sinks = {
+        "snowflake": _store_session_layers(session_id, s["project_id"], fused_dicts, verdict_dicts, health),
+        "gemini_insights": gemini.generate_session_insights(fused_dicts, verdict_dicts, health),
+    }
+    if embeddings:
+        sinks["vectorai"] = vectorai.upsert(embeddings)
+    results = dict(zip(sinks, await asyncio.gather(*sinks.values(), return_exceptions=True)))
+    if not isinstance(results["snowflake"], Exception):
+        results.update(results.pop("snowflake"))
+    for name, res in results.items():
+        if isinstance(res, Exception):
+            logger.error(f"[finalize] {name} failed for {session_id}: {res}")
+
+    insights = results["gemini_insights"]
+    session_insights[session_id] = (
+        "Insight generation failed." if isinstance(insights, Exception) else insights
+    )
 
     s["status"] = "complete"
+    project_versions[s["project_id"]] = project_versions.get(s["project_id"], 0) + 1
     return {"status": "complete", "health_score": health, "verdicts_count": len(verdicts)}
 
+
+async def _store_session_layers(
+    session_id: str, project_id: str, fused_dicts: List[Dict], verdict_dicts: List[Dict], health: float,
+) -> Dict[str, Any]:
+    """Write the Snowflake layers one after another on a single connection.
+
+    Returns {sink_name: rows_written | Exception} so finalize can log each layer.
+    """
+    await snowflake.ensure_tables()
+    writes = {
+        "snowflake_fused": lambda: snowflake.store_fused_rows(session_id, fused_dicts, project_id),
+        "snowflake_verdicts": lambda: snowflake.store_verdicts(session_id, verdict_dicts, project_id),
+        "snowflake_health": lambda: snowflake.store_health_score(session_id, health, project_id),
+    }
+    results: Dict[str, Any] = {}
+    for name, write in writes.items():
+        try:
+            results[name] = await write()
+        except Exception as exc:
+            results[name] = exc
+    return results
+
 # ────────────────────────────────────────────────────────────
 #   RESULT ENDPOINTS
 # ────────────────────────────────────────────────────────────
 
 @app.get("/v1/sessions/{session_id}/timeline")
-async def get_timeline(session_id: str):
+async def get_timeline(session_id: str, max_points: Optional[int] = Query(None, ge=3)):
     if session_id not in session_fused:
         raise HTTPException(404, "No fused data yet")
-    return {"session_id": session_id, "rows": session_fused[session_id]}
+    # The fused timeline is immutable once finalized, so the encoded body is built once
+    # per (session, max_points) and replayed on every dashboard refresh
+    cached = timeline_json_cache.setdefault(session_id, OrderedDict())
+    body = cached.get(max_points)
+    if body is None:
+        rows = session_fused[session_id]
+        if max_points is not None:
+            # LTTB-thinned for charts; shape-preserving, so long sessions stay cheap to ship and draw
+            rows = downsample_rows(rows, max_points)
+        body = orjson.dumps({"session_id": session_id, "rows": rows}, option=orjson.OPT_SERIALIZE_NUMPY)
+        cached[max_points] = body
+        if len(cached) > TIMELINE_CACHE_VARIANTS:  # evict the least recently used max_points
+            cached.popitem(last=False)
+    else:
+        cached.move_to_end(max_points)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/v1/sessions/{session_id}/verdicts")
 async def get_verdicts(session_id: str):
     if session_id not in session_verdicts:
         raise HTTPException(404, "No verdicts yet")
-    return {"session_id": session_id, "verdicts": session_verdicts[session_id]}
+    return ORJSONResponse({"session_id": session_id, "verdicts": session_verdicts[session_id]})
 
 
 @app.get("/v1/sessions/{session_id}/insights")
@@ -554,27 +607,50 @@ async def get_health_score(session_id: str):
 @app.get("/v1/sessions/{session_id}/chunks")
 async def get_chunks(session_id: str):
     crs = chunk_results.get(session_id, {})
-    out = []
-    for idx in sorted(crs.keys()):
-        cr = crs[idx]
-        out.append({
-            "chunk_index": cr.chunk_index,
-            "chunk_start_sec": cr.time_range_sec[0],
-            "summary": cr.chunk_summary,
-            "end_status": cr.end_status,
-            "states_observed": [
-                {"state": o.state_name, "entered_at_sec": o.entered_at_sec,
-                 "exited_at_sec": o.exited_at_sec, "progress": o.progress}
-                for o in cr.states_observed
-            ],
-            "events": [
-                {"type": e.type, "description": e.description, "timestamp_sec": e.timestamp_sec}
-                for e in cr.events
-            ],
-        })
+    out = [_chunk_to_dict(crs[idx]) for idx in sorted(crs.keys())]
     return {"session_id": session_id, "chunks": out}
 
 
+@app.get("/v1/sessions/{session_id}/chunks/{chunk_index}")
+async def get_chunk(session_id: str, chunk_index: int, wait: float = Query(0.0, ge=0.0, le=30.0)):
+    """Return a single processed chunk.
+
+    With ?wait=N the request long-polls for up to N seconds until the
+    Gemini worker finishes the chunk, instead of clients polling /chunks.
+    """
+    if session_id not in sessions:
+        raise HTTPException(404, "Session not found")
+    cr = chunk_results.get(session_id, {}).get(chunk_index)
+    # Only long-poll chunks that were actually uploaded; anything else can never arrive
+    if cr is None and wait > 0 and chunk_index in session_chunks.get(session_id, {}):
+        try:
+            await asyncio.wait_for(_chunk_event(session_id, chunk_index).wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+        cr = chunk_results.get(session_id, {}).get(chunk_index)
+    if cr is None:
+        raise HTTPException(404, "Chunk not processed yet")
+    return _chunk_to_dict(cr)
+
+
+def _chunk_to_dict(cr: ChunkResult) -> Dict:
+    return {
+        "chunk_index": cr.chunk_index,
+        "chunk_start_sec": cr.time_range_sec[0],
+        "summary": cr.chunk_summary,
+        "end_status": cr.end_status,
+        "states_observed": [
+            {"state": o.state_name, "entered_at_sec": o.entered_at_sec,
+             "exited_at_sec": o.exited_at_sec, "progress": o.progress}
+            for o in cr.states_observed
+        ],
+        "events": [
+            {"type": e.type, "description": e.description, "timestamp_sec": e.timestamp_sec}
+            for e in cr.events
+        ],
+    }
+
+
 @app.get("/v1/sessions/{session_id}/events")
 async def get_events(session_id: str):
     return {"session_id": session_id, "events": session_events.get(session_id, [])}
@@ -607,11 +683,26 @@ async def aggregate_verdicts(project_id: str):
     for s in proj_sessions:
         vds = session_verdicts.get(s["id"], [])
         all_v[s["id"]] = vds
-    return {"project_id": project_id, "by_session": all_v}
+    return ORJSONResponse({"project_id": project_id, "by_session": all_v})
 
 
 @app.get("/v1/projects/{project_id}/aggregate/insights")
-async def aggregate_insights(project_id: str):
+async def aggregate_insights(project_id: str, request: Request, response: Response):
+    """Cross-tester Gemini insights, cached until another session in the project completes.
+
+    Stub fallback text is never cached, so the next request retries the model.
+    """
+    version = project_versions.get(project_id, 0)
+    etag = f'"{project_id}-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    cached = aggregate_insights_cache.get(project_id)
+    if cached and cached[0] == version:
+        return cached[1]
+
     proj_sessions = [s for s in sessions.values() if s["project_id"] == project_id and s["status"] == "complete"]
     agg_data = []
     for s in proj_sessions:
@@ -622,7 +713,13 @@ async def aggregate_insights(project_id: str):
             "verdicts": session_verdicts.get(s["id"], []),
         })
     insights_text = await gemini.generate_cross_tester_insights(agg_data)
-    return {"project_id": project_id, "insights": insights_text}
+    payload = {"project_id": project_id, "insights": insights_text}
+    if insights_text == gemini._stub_cross_tester(agg_data):
+        # Gemini unavailable or failed — don't pin the stub until the next session completes
+        del response.headers["ETag"]
+        return payload
+    aggregate_insights_cache[project_id] = (version, payload)
+    return payload
 
 
 @app.get("/v1/projects/{project_id}/health-trend")
@@ -666,14 +763,21 @@ async def vector_search(project_id: str, body: VectorSearchReq):
 # ────────────────────────────────────────────────────────────
 
 @app.post("/v1/sessions/{session_id}/emotion-frames")
-async def upload_emotion_frames(session_id: str, body: EmotionFrameBatchReq):
+async def upload_emotion_frames(session_id: str, request: Request):
     """Receive a batch of emotion frames from the desktop Presage client."""
     s = sessions.get(session_id)
     if not s:
         raise HTTPException(404, "Session not found")
+    try:
+        body = _emotion_batch_decoder.decode(await request.body())
+        # Struct construction doesn't validate, so check every frame against EmotionFrame
+        # here; the raw dicts are kept since they carry extra fields (gaze, head pose)
+        msgspec.convert(body.frames, type=List[EmotionFrame])
+    except msgspec.DecodeError as e:  # also covers msgspec.ValidationError
+        raise HTTPException(422, f"Invalid emotion frame batch: {e}")
     if session_id not in session_emotion_frames:
-        session_emotion_frames[session_id] = []
-    session_emotion_frames[session_id].extend(body.frames)
+        session_emotion_frames[session_id] = SessionBuffers()
+    session_emotion_frames[session_id].append(body.frames)
     return {
         "status": "ok",
         "frames_received": len(body.frames),
@@ -695,7 +799,7 @@ async def upload_watch_data(session_id: str, body: WatchDataReq):
         "movement_variance": body.movement_variance,
     }
     if session_id not in session_watch_data:
-        session_watch_data[session_id] = []
+        session_watch_data[session_id] = WatchBuffer(session_id)
     session_watch_data[session_id].append(reading)
     return {"status": "ok", "readings_count": len(session_watch_data[session_id])}
 
@@ -730,18 +834,28 @@ async def watch_stream(ws: WebSocket, session_id: str):
     await ws.accept()
     try:
         while True:
-            data = await ws.receive_json()
-            reading = {
-                "timestamp_sec": data.get("timestamp_sec", time.time() - s.get("created_at", time.time())),
-                "heart_rate": data.get("heart_rate", 0),
-                "hrv_rmssd": data.get("hrv_rmssd", 0),
-                "hrv_sdnn": data.get("hrv_sdnn", 0),
-                "movement_variance": data.get("movement_variance", 0),
-            }
-            if session_id not in session_watch_data:
-                session_watch_data[session_id] = []
-            session_watch_data[session_id].append(reading)
-            await ws.send_json({"status": "ok", "readings_count": len(session_watch_data[session_id])})
+            # Clients may send compact msgpack binary frames or JSON text; ack in kind
+            msg = await ws.receive()
+            if msg["type"] == "websocket.disconnect":
+                break
+            binary = msg.get("bytes") is not None
+            data = msgpack.unpackb(msg["bytes"]) if binary else orjson.loads(msg["text"])
+            try:
+                reading = msgspec.convert(
+                    {"timestamp_sec": time.time() - s.get("created_at", time.time()), **data},
+                    type=WatchReading,
+                )
+            except (msgspec.ValidationError, TypeError) as e:  # TypeError: payload is not a map
+                ack = {"status": "error", "detail": f"Invalid watch reading: {e}"}
+            else:
+                if session_id not in session_watch_data:
+                    session_watch_data[session_id] = WatchBuffer(session_id)
+                session_watch_data[session_id].append(msgspec.structs.asdict(reading))
+                ack = {"status": "ok", "readings_count": len(session_watch_data[session_id])}
+            if binary:
+                await ws.send_bytes(msgpack.packb(ack, use_bin_type=True))
+            else:
+                await ws.send_text(orjson.dumps(ack).decode())
     except WebSocketDisconnect:
         pass
 
@@ -761,5 +875,13 @@ async def root():
 
 # ── Run ──────────────────────────────────────────────────────
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # libuv event loop + C HTTP parser; uvloop has no Windows build
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=True,
+    )
@@ -1,40 +1,51 @@
 """
-PatchLab — Pydantic models.
+PatchLab — Pydantic models, DFA dataclasses and msgspec structs.
 
 Covers: DFA config, projects, sessions, events, emotions, verdicts, fused rows.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+import msgspec
 from pydantic import BaseModel, Field
 
 
 # ── DFA State & Project Config ──────────────────────────────────────────────
 
 
-class DFAState(BaseModel):
+# The DFA definition is validated once at the API boundary (main._build_dfa_config,
+# through a pydantic TypeAdapter) and then read-only for the rest of the session —
+# fusion, verdicts and every chunk prompt walk it — so it is stored as slotted,
+# frozen dataclasses rather than Pydantic models.
+
+
+@dataclass(slots=True, frozen=True)
+class DFAState:
     name: str
-    description: str = ""
-    visual_cues: List[str] = []
-    failure_indicators: List[str] = []
-    success_indicators: List[str] = []
     intended_emotion: str  # frustration, confusion, delight, boredom, surprise, tense, calm, excited, satisfied, curious
+    description: str = ""
+    visual_cues: Tuple[str, ...] = ()
+    failure_indicators: Tuple[str, ...] = ()
+    success_indicators: Tuple[str, ...] = ()
     acceptable_range: Tuple[float, float] = (0.3, 0.8)
     expected_duration_sec: float = 30.0
 
 
-class DFATransitionDef(BaseModel):
+@dataclass(slots=True, frozen=True)
+class DFATransitionDef:
     from_state: str
     to_state: str
     trigger: str = ""
 
 
-class DFAConfig(BaseModel):
-    states: List[DFAState] = []
-    transitions: List[DFATransitionDef] = []
+@dataclass(slots=True, frozen=True)
+class DFAConfig:
+    states: Tuple[DFAState, ...] = ()
+    transitions: Tuple[DFATransitionDef, ...] = ()
 
 
 # ── Request models ──────────────────────────────────────────────────────────
@@ -84,7 +95,13 @@ class Session(BaseModel):
 # ── Emotion / Biometric frames ─────────────────────────────────────────────
 
 
-class EmotionFrame(BaseModel):
+# EmotionFrame / WatchReading arrive at 1-10 Hz per session and never cross the
+# FastAPI request/response contract, so they are plain msgspec Structs rather
+# than Pydantic models. Struct construction does not validate: untrusted input
+# must go through msgspec.convert(..., type=EmotionFrame / WatchReading).
+
+
+class EmotionFrame(msgspec.Struct):
     timestamp_sec: float
     frustration: float = 0.0
     confusion: float = 0.0
@@ -96,7 +113,12 @@ class EmotionFrame(BaseModel):
     breathing_rate: float = 0.0
 
 
-class WatchReading(BaseModel):
+# Emotion score fields in declaration order, so trusted ingest paths can build
+# frames positionally — EmotionFrame(t, *scores) — with no per-frame kwargs dict.
+EMOTION_KEYS: Tuple[str, ...] = EmotionFrame.__struct_fields__[1:7]
+
+
+class WatchReading(msgspec.Struct):
     timestamp_sec: float
     heart_rate: float = 0.0
     hrv_rmssd: float = 0.0
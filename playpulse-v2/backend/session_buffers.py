@@ -0,0 +1,161 @@
+"""
+PatchLab — Per-session stream buffers (struct-of-arrays).
+
+The desktop client posts Presage frames in small batches (~10 Hz). Keeping
+them only as a list of dicts means every chunk worker re-scans the whole
+session to find its time window. SessionBuffers keeps the raw dicts for
+API compatibility, but also maintains a sorted float64 timestamp column
+and an (N, 6) float64 emotion matrix, so window lookups are a pair of
+np.searchsorted calls and finalize can build frames without dict lookups.
+
+New frames are staged in plain lists and flushed into the arrays every
+FLUSH_EVERY frames (or on first read) to amortize array reallocation.
+
+WatchBuffer holds the ~1 Hz Apple Watch stream in a file-backed np.memmap
+structured array, so long sessions grow a file on disk rather than the
+process heap; fusion reads the live slice zero-copy. The file is created on
+the first reading, and close() (called on finalize and at shutdown) moves the
+readings onto the heap and deletes it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import SESSION_SPILL_DIR
+from fusion import EMOTION_COLS
+
+logger = logging.getLogger(__name__)
+
+FLUSH_EVERY = 128
+
+WATCH_DTYPE = np.dtype([
+    ("timestamp_sec",     "f8"),
+    ("heart_rate",        "f8"),
+    ("hrv_rmssd",         "f8"),
+    ("hrv_sdnn",          "f8"),
+    ("movement_variance", "f8"),
+])
+
+
+class SessionBuffers:
+    """Append-only SoA store for one session's emotion frames."""
+
+    __slots__ = ("frames", "ts", "scores", "_pending_ts", "_pending_scores")
+
+    def __init__(self):
+        self.frames: List[Dict] = []
+        self.ts = np.empty(0, dtype=np.float64)
+        self.scores = np.empty((0, len(EMOTION_COLS)), dtype=np.float64)
+        self._pending_ts: List[float] = []
+        self._pending_scores: List[list] = []
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def append(self, frames: List[Dict]) -> None:
+        """Stage a batch of frame dicts; flushes to the arrays every FLUSH_EVERY frames."""
+        self.frames.extend(frames)
+        for f in frames:
+            get = f.get
+            self._pending_ts.append(float(get("timestamp_sec", 0.0)))
+            # float conversion happens once per flush in np.asarray
+            self._pending_scores.append([get(c, 0.0) for c in EMOTION_COLS])
+        if len(self._pending_ts) >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Move staged frames into the column arrays, keeping them sorted by time."""
+        if not self._pending_ts:
+            return
+        new_ts = np.asarray(self._pending_ts, dtype=np.float64)
+        new_scores = np.asarray(self._pending_scores, dtype=np.float64).reshape(-1, len(EMOTION_COLS))
+        self._pending_ts.clear()
+        self._pending_scores.clear()
+
+        in_order = (self.ts.size == 0 or new_ts[0] >= self.ts[-1]) and bool(np.all(np.diff(new_ts) >= 0))
+        self.ts = np.concatenate([self.ts, new_ts])
+        self.scores = np.concatenate([self.scores, new_scores])
+        if not in_order:
+            # Out-of-order batch (client retry / clock skew) — re-sort all columns together
+            order = np.argsort(self.ts, kind="stable")
+            self.ts = self.ts[order]
+            self.scores = self.scores[order]
+            self.frames = [self.frames[i] for i in order]
+
+    def window(self, start_sec: float, end_sec: float) -> List[Dict]:
+        """Raw frame dicts with start_sec <= timestamp_sec < end_sec."""
+        self.flush()
+        lo, hi = np.searchsorted(self.ts, [start_sec, end_sec], side="left")
+        return self.frames[lo:hi]
+
+
+class WatchBuffer:
+    """Append-only, memory-mapped store for one session's watch readings."""
+
+    __slots__ = ("path", "cursor", "_capacity", "_mm")
+
+    def __init__(self, session_id: str, capacity: int = 4096, spill_dir: str = SESSION_SPILL_DIR):
+        self.path: Optional[str] = os.path.join(spill_dir, f"{session_id}.watch.bin")
+        self.cursor = 0
+        self._capacity = capacity
+        # Heap-backed until the first reading arrives, so sessions without a
+        # watch never leave a spill file behind
+        self._mm: np.ndarray = np.zeros(0, dtype=WATCH_DTYPE)
+
+    def __len__(self) -> int:
+        return self.cursor
+
+    def append(self, reading: Dict) -> None:
+        if self.cursor == self._mm.shape[0]:
+            self._grow()
+        self._mm[self.cursor] = tuple(float(reading.get(name, 0.0)) for name in WATCH_DTYPE.names)
+        self.cursor += 1
+
+    def _grow(self) -> None:
+        """Double the backing file and re-map it; existing rows stay on disk."""
+        capacity = max(self._mm.shape[0] * 2, self._capacity, 8)
+        if self.path is None:
+            # Closed: the readings live on the heap now
+            grown = np.zeros(capacity, dtype=WATCH_DTYPE)
+            grown[:self.cursor] = self._mm[:self.cursor]
+            self._mm = grown
+            return
+        if not isinstance(self._mm, np.memmap):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._mm = np.memmap(self.path, dtype=WATCH_DTYPE, mode="w+", shape=(capacity,))
+            return
+        self._mm.flush()
+        del self._mm
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * WATCH_DTYPE.itemsize)
+        self._mm = np.memmap(self.path, dtype=WATCH_DTYPE, mode="r+", shape=(capacity,))
+
+    def view(self) -> np.ndarray:
+        """Zero-copy structured-array view of the readings written so far."""
+        return self._mm[:self.cursor]
+
+    def close(self) -> None:
+        """Copy the readings onto the heap, unmap and delete the backing file. Idempotent.
+
+        Callers should drop any view() they hold first: on Windows a file that is
+        still mapped can't be deleted, in which case it is left for the OS to reap.
+        """
+        if self.path is None:
+            return
+        path, self.path = self.path, None
+        if not isinstance(self._mm, np.memmap):
+            return
+        mm = self._mm
+        self._mm = np.array(mm[:self.cursor])
+        del mm
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.warning(f"[session_buffers] Could not remove {path}: {exc}")
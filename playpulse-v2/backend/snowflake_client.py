@@ -7,13 +7,20 @@ Medallion architecture:
   Gold:   verdicts, health scores, session summaries
 
 Falls back to in-memory storage when Snowflake credentials are missing.
+
+snowflake-connector-python is blocking, so every real-Snowflake call runs
+in a worker thread via asyncio.to_thread and never stalls the event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import threading
+import uuid
+from contextlib import contextmanager
 from typing import Any, Dict, List, Optional
 
 from config import (
@@ -27,6 +34,17 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+# write_pandas bulk-load settings for SILVER_FUSED (PUT → COPY INTO)
+BULK_PARALLEL = 8
+BULK_CHUNK_SIZE = 16000
+
+_FUSED_COLUMNS = [
+    "project_id", "session_id", "t", "state", "time_in_state_sec",
+    "frustration", "confusion", "delight", "boredom", "surprise", "engagement",
+    "hr", "hrv_rmssd", "hrv_sdnn", "presage_hr", "breathing_rate",
+    "intent_delta", "dominant_emotion", "data_quality",
+]
+
 # ─────────────────────────────────────────────────────────────────────────────
 # DDL — Snowflake table definitions (medallion architecture)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -99,6 +117,14 @@ class SnowflakeClient:
     def __init__(self):
         self._conn = None
         self._tables_created = False
+        # Writes run in concurrent to_thread workers; these keep a cold client from
+        # opening several connections or racing the CREATE TABLE DDL
+        self._conn_lock = threading.Lock()
+        self._tables_lock = threading.Lock()
+        # All writes share one connection (one Snowflake session); serializing them keeps
+        # another worker's statement from landing inside, or being rolled back with, an
+        # open replace transaction
+        self._write_lock = threading.RLock()
         # In-memory fallback when Snowflake is not configured
         self._mem: Dict[str, List[Dict]] = {
             "bronze_gameplay_events": [],
@@ -110,47 +136,75 @@ class SnowflakeClient:
     # ── Connection management ────────────────────────────────
 
     def _get_connection(self):
-        """Return a live Snowflake connection. Caches it for reuse."""
-        if self._conn is not None:
-            try:
-                self._conn.cursor().execute("SELECT 1")
-                return self._conn
-            except Exception:
-                self._conn = None
-
-        import snowflake.connector
-        self._conn = snowflake.connector.connect(
-            account=SNOWFLAKE_ACCOUNT,
-            user=SNOWFLAKE_USER,
-            password=SNOWFLAKE_PASSWORD,
-            warehouse=SNOWFLAKE_WAREHOUSE,
-            database=SNOWFLAKE_DATABASE,
-            schema=SNOWFLAKE_SCHEMA,
-        )
-        logger.info(
-            f"[snowflake] Connected to {SNOWFLAKE_ACCOUNT} "
-            f"db={SNOWFLAKE_DATABASE} schema={SNOWFLAKE_SCHEMA}"
-        )
-        return self._conn
+        """Return a live Snowflake connection. Caches it for reuse (thread-safe)."""
+        with self._conn_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.cursor().execute("SELECT 1")
+                    return self._conn
+                except Exception:
+                    self._conn = None
+
+            import snowflake.connector
+            self._conn = snowflake.connector.connect(
+                account=SNOWFLAKE_ACCOUNT,
+                user=SNOWFLAKE_USER,
+                password=SNOWFLAKE_PASSWORD,
+                warehouse=SNOWFLAKE_WAREHOUSE,
+                database=SNOWFLAKE_DATABASE,
+                schema=SNOWFLAKE_SCHEMA,
+            )
+            logger.info(
+                f"[snowflake] Connected to {SNOWFLAKE_ACCOUNT} "
+                f"db={SNOWFLAKE_DATABASE} schema={SNOWFLAKE_SCHEMA}"
+            )
+            return self._conn
 
     def _ensure_tables(self):
-        """Create all tables if they don't exist. Idempotent."""
+        """Create all tables if they don't exist. Idempotent and thread-safe."""
         if self._tables_created:
             return
-        conn = self._get_connection()
-        for name, ddl in _DDL.items():
+        with self._tables_lock:
+            if self._tables_created:
+                return
+            conn = self._get_connection()
+            with self._write_lock:  # DDL implicitly commits any open transaction
+                for name, ddl in _DDL.items():
+                    try:
+                        conn.cursor().execute(ddl.strip())
+                        logger.debug(f"[snowflake] Table ready: {name}")
+                    except Exception as exc:
+                        logger.error(f"[snowflake] Failed to create {name}: {exc}")
+                        raise
+            self._tables_created = True
+
+    async def ensure_tables(self) -> None:
+        """Create the tables up front (no-op for the in-memory fallback)."""
+        if self._use_real():
+            await asyncio.to_thread(self._ensure_tables)
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN … COMMIT on the shared connection, rolled back if the body raises."""
+        with self._write_lock:
+            cur = self._get_connection().cursor()
+            cur.execute("BEGIN")
             try:
-                conn.cursor().execute(ddl.strip())
-                logger.debug(f"[snowflake] Table ready: {name}")
-            except Exception as exc:
-                logger.error(f"[snowflake] Failed to create {name}: {exc}")
+                yield cur
+            except Exception:
+                cur.execute("ROLLBACK")
                 raise
-        self._tables_created = True
+            cur.execute("COMMIT")
 
     def _use_real(self) -> bool:
         """Check if real Snowflake should be used."""
         return bool(SNOWFLAKE_ACCOUNT and SNOWFLAKE_USER and SNOWFLAKE_PASSWORD)
 
+    def _mem_replace(self, table: str, session_id: str, rows: List[Dict]) -> None:
+        """In-memory counterpart of the DELETE + INSERT replace used for real tables."""
+        kept = [r for r in self._mem.get(table, []) if r.get("session_id") != session_id]
+        self._mem[table] = kept + rows
+
     # ── Generic insert / query ──────────────────────────────
 
     async def insert(self, table: str, rows: List[Dict]) -> int:
@@ -161,17 +215,21 @@ class SnowflakeClient:
             self._mem[table].extend(rows)
             return len(rows)
 
+        return await asyncio.to_thread(self._insert_sync, table, rows)
+
+    def _insert_sync(self, table: str, rows: List[Dict]) -> int:
         self._ensure_tables()
         conn = self._get_connection()
-        for row in rows:
-            try:
-                conn.cursor().execute(
-                    f"INSERT INTO {table} (session_id, raw_json) "
-                    f"SELECT %s, PARSE_JSON(%s)",
-                    (row.get("session_id", ""), json.dumps(row)),
-                )
-            except Exception as exc:
-                logger.error(f"[snowflake] insert into {table} failed: {exc}")
+        with self._write_lock:
+            for row in rows:
+                try:
+                    conn.cursor().execute(
+                        f"INSERT INTO {table} (session_id, raw_json) "
+                        f"SELECT %s, PARSE_JSON(%s)",
+                        (row.get("session_id", ""), json.dumps(row)),
+                    )
+                except Exception as exc:
+                    logger.error(f"[snowflake] insert into {table} failed: {exc}")
         return len(rows)
 
     async def query(
@@ -187,6 +245,9 @@ class SnowflakeClient:
                 if all(r.get(k) == v for k, v in filters.items())
             ]
 
+        return await asyncio.to_thread(self._query_sync, table, filters)
+
+    def _query_sync(self, table: str, filters: Optional[Dict[str, Any]]) -> List[Dict]:
         self._ensure_tables()
         conn = self._get_connection()
         where_clauses = []
@@ -215,19 +276,19 @@ class SnowflakeClient:
 
         if not self._use_real():
             tagged = [{**r, "session_id": session_id, "project_id": project_id} for r in rows]
-            self._mem.setdefault("silver_fused_rows", []).extend(tagged)
+            self._mem_replace("silver_fused_rows", session_id, tagged)
             logger.info(f"[snowflake][mem] SILVER_FUSED: {len(rows)} rows for {session_id}")
             return len(rows)
 
+        return await asyncio.to_thread(self._store_fused_rows_sync, session_id, rows, project_id)
+
+    def _store_fused_rows_sync(self, session_id: str, rows: List[Dict], project_id: str) -> int:
         self._ensure_tables()
         conn = self._get_connection()
-        sql = """
+        sql = f"""
             INSERT INTO SILVER_FUSED
-            (project_id, session_id, t, state, time_in_state_sec,
-             frustration, confusion, delight, boredom, surprise, engagement,
-             hr, hrv_rmssd, hrv_sdnn, presage_hr, breathing_rate,
-             intent_delta, dominant_emotion, data_quality)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ({", ".join(_FUSED_COLUMNS)})
+            VALUES ({", ".join(["%s"] * len(_FUSED_COLUMNS))})
         """
         batch = []
         for r in rows:
@@ -252,11 +313,54 @@ class SnowflakeClient:
                 str(r.get("dominant_emotion", "unknown")),
                 float(r.get("data_quality", 1.0)),
             ))
+
+        # Replace rather than append, so a retried or re-run finalize can't duplicate rows
+        delete_sql = "DELETE FROM SILVER_FUSED WHERE session_id = %s"
+
+        # Bulk path: stage gzip'd files in parallel and COPY INTO, instead of row-by-row binds
+        try:
+            import pandas as pd
+            from snowflake.connector.pandas_tools import write_pandas
+        except ImportError as exc:
+            logger.warning(f"[snowflake] SILVER_FUSED bulk load unavailable ({exc}), using executemany")
+        else:
+            df = pd.DataFrame(batch, columns=[c.upper() for c in _FUSED_COLUMNS])
+            # write_pandas issues DDL (temp stage), which would implicitly commit an open
+            # transaction, so COPY into a temp staging table first and only then swap the
+            # session's rows in one DELETE + INSERT … SELECT transaction
+            stage = f"SILVER_FUSED_STAGE_{uuid.uuid4().hex[:12].upper()}"
+            cols = ", ".join(_FUSED_COLUMNS)
+            with self._write_lock:  # the DDL here would also commit another worker's open transaction
+                try:
+                    conn.cursor().execute(f"CREATE TEMPORARY TABLE {stage} LIKE SILVER_FUSED")
+                    ok, _, nrows, _ = write_pandas(
+                        conn, df, stage,
+                        parallel=BULK_PARALLEL, compression="gzip", chunk_size=BULK_CHUNK_SIZE,
+                    )
+                    if not ok:
+                        raise RuntimeError("COPY INTO reported failure")
+                    with self._transaction() as cur:
+                        cur.execute(delete_sql, (session_id,))
+                        cur.execute(f"INSERT INTO SILVER_FUSED ({cols}) SELECT {cols} FROM {stage}")
+                except Exception as exc:
+                    logger.error(f"[snowflake] SILVER_FUSED bulk load failed for {session_id}: {exc}")
+                    return 0
+                finally:
+                    try:
+                        conn.cursor().execute(f"DROP TABLE IF EXISTS {stage}")
+                    except Exception as exc:
+                        logger.warning(f"[snowflake] could not drop {stage}: {exc}")
+            logger.info(f"[snowflake] SILVER_FUSED: bulk-loaded {nrows} rows for {session_id}")
+            return len(batch)
+
         try:
-            conn.cursor().executemany(sql, batch)
+            with self._transaction() as cur:
+                cur.execute(delete_sql, (session_id,))
+                cur.executemany(sql, batch)
             logger.info(f"[snowflake] SILVER_FUSED: inserted {len(batch)} rows for {session_id}")
         except Exception as exc:
             logger.error(f"[snowflake] SILVER_FUSED write failed: {exc}")
+            return 0
         return len(batch)
 
     async def store_verdicts(self, session_id: str, verdicts: List[Dict], project_id: str = "") -> int:
@@ -266,12 +370,14 @@ class SnowflakeClient:
 
         if not self._use_real():
             tagged = [{**v, "session_id": session_id, "project_id": project_id} for v in verdicts]
-            self._mem.setdefault("gold_verdicts", []).extend(tagged)
+            self._mem_replace("gold_verdicts", session_id, tagged)
             logger.info(f"[snowflake][mem] GOLD_VERDICTS: {len(verdicts)} for {session_id}")
             return len(verdicts)
 
+        return await asyncio.to_thread(self._store_verdicts_sync, session_id, verdicts, project_id)
+
+    def _store_verdicts_sync(self, session_id: str, verdicts: List[Dict], project_id: str) -> int:
         self._ensure_tables()
-        conn = self._get_connection()
         sql = """
             INSERT INTO GOLD_VERDICTS
             (project_id, session_id, state_name, intended_emotion, verdict,
@@ -292,31 +398,40 @@ class SnowflakeClient:
                 json.dumps(v),  # JSON string stored as VARCHAR
             ))
         try:
-            conn.cursor().executemany(sql, batch)
+            with self._transaction() as cur:
+                cur.execute("DELETE FROM GOLD_VERDICTS WHERE session_id = %s", (session_id,))
+                cur.executemany(sql, batch)
             logger.info(f"[snowflake] GOLD_VERDICTS: inserted {len(batch)} for {session_id}")
         except Exception as exc:
             logger.error(f"[snowflake] GOLD_VERDICTS write failed: {exc}")
+            return 0
         return len(batch)
 
     async def store_health_score(self, session_id: str, score: float, project_id: str = "") -> int:
         """Write overall Playtest Health Score to GOLD_HEALTH_SCORES."""
         if not self._use_real():
-            self._mem.setdefault("gold_health_scores", []).append(
-                {"session_id": session_id, "score": score, "project_id": project_id}
+            self._mem_replace(
+                "gold_health_scores", session_id,
+                [{"session_id": session_id, "score": score, "project_id": project_id}],
             )
             logger.info(f"[snowflake][mem] GOLD_HEALTH: {session_id} → {score}")
             return 1
 
+        return await asyncio.to_thread(self._store_health_score_sync, session_id, score, project_id)
+
+    def _store_health_score_sync(self, session_id: str, score: float, project_id: str) -> int:
         self._ensure_tables()
-        conn = self._get_connection()
         try:
-            conn.cursor().execute(
-                "INSERT INTO GOLD_HEALTH_SCORES (project_id, session_id, health_score) VALUES (%s, %s, %s)",
-                (project_id, session_id, float(score)),
-            )
+            with self._transaction() as cur:
+                cur.execute("DELETE FROM GOLD_HEALTH_SCORES WHERE session_id = %s", (session_id,))
+                cur.execute(
+                    "INSERT INTO GOLD_HEALTH_SCORES (project_id, session_id, health_score) VALUES (%s, %s, %s)",
+                    (project_id, session_id, float(score)),
+                )
             logger.info(f"[snowflake] GOLD_HEALTH: {session_id} → {score}")
         except Exception as exc:
             logger.error(f"[snowflake] GOLD_HEALTH write failed: {exc}")
+            return 0
         return 1
 
     async def store_gameplay_events(
@@ -347,6 +462,13 @@ class SnowflakeClient:
             logger.info(f"[snowflake][mem] BRONZE_EVENTS: {len(events)} for {session_id} chunk {chunk_index}")
             return len(events)
 
+        return await asyncio.to_thread(
+            self._store_gameplay_events_sync, session_id, chunk_index, tagged, project_id,
+        )
+
+    def _store_gameplay_events_sync(
+        self, session_id: str, chunk_index: int, tagged: List[Dict], project_id: str,
+    ) -> int:
         self._ensure_tables()
         conn = self._get_connection()
         sql = """
@@ -366,7 +488,8 @@ class SnowflakeClient:
                 json.dumps(ev),
             ))
         try:
-            conn.cursor().executemany(sql, batch)
+            with self._write_lock:
+                conn.cursor().executemany(sql, batch)
             logger.info(f"[snowflake] BRONZE_EVENTS: inserted {len(batch)} for {session_id} chunk {chunk_index}")
         except Exception as exc:
             logger.error(f"[snowflake] BRONZE_EVENTS write failed: {exc}")
@@ -394,6 +517,9 @@ class SnowflakeClient:
             logger.warning("[snowflake][mem] delete_project_data called but no real connection")
             return {}
 
+        return await asyncio.to_thread(self._delete_project_data_sync, project_id)
+
+    def _delete_project_data_sync(self, project_id: str) -> Dict[str, int]:
         self._ensure_tables()
         conn = self._get_connection()
         deleted = {}
@@ -402,7 +528,8 @@ class SnowflakeClient:
         for table in tables:
             try:
                 cur = conn.cursor()
-                cur.execute(f"DELETE FROM {table} WHERE project_id = %s", (project_id,))
+                with self._write_lock:
+                    cur.execute(f"DELETE FROM {table} WHERE project_id = %s", (project_id,))
                 deleted[table] = cur.rowcount
                 logger.info(f"[snowflake] Deleted {cur.rowcount} rows from {table} for project {project_id}")
             except Exception as exc:
@@ -417,6 +544,9 @@ class SnowflakeClient:
             logger.warning("[snowflake][mem] run_query called but no real connection")
             return []
 
+        return await asyncio.to_thread(self._run_query_sync, sql, params)
+
+    def _run_query_sync(self, sql: str, params: tuple) -> List[Dict]:
         self._ensure_tables()
         conn = self._get_connection()
         try:
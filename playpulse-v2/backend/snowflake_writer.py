@@ -30,9 +30,11 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import orjson
 import pandas as pd
 
 from config import (
@@ -281,7 +283,7 @@ def write_bronze_presage(
             d["presage_hr"], d["breathing_rate"],
             d["gaze_x"], d["gaze_y"], d["gaze_confidence"],
             d["head_pitch"], d["head_yaw"], d["head_roll"],
-            json.dumps(d),
+            orjson.dumps(d, option=orjson.OPT_SERIALIZE_NUMPY).decode(),
         ))
 
     close_after = conn is None
@@ -334,7 +336,7 @@ def write_bronze_watch(
             hrv_s = float(r.get("hrv_sdnn", 0.0))
             mv    = float(r.get("movement_variance", 0.0))
         rows.append((session_id, project_id, ts, hr, hrv_r, hrv_s, mv,
-                     json.dumps({"hr": hr, "hrv_rmssd": hrv_r})))
+                     orjson.dumps({"hr": hr, "hrv_rmssd": hrv_r}, option=orjson.OPT_SERIALIZE_NUMPY).decode()))
 
     close_after = conn is None
     if conn is None:
@@ -578,6 +580,7 @@ def write_gold(
         total_deaths = int(fused_df.get("total_deaths", pd.Series([0])).sum()) \
             if "total_deaths" in fused_df.columns else 0
         dominant = fused_df["dominant_emotion"].mode()[0] if "dominant_emotion" in fused_df.columns else "unknown"
+        verdict_counts = Counter(v["verdict"] for v in state_verdicts)  # single pass for all counts
 
         _execute(conn, """
             INSERT INTO GOLD_SESSION_SUMMARY
@@ -589,9 +592,9 @@ def write_gold(
             session_id, project_id,
             len(fused_df),
             health_score,
-            sum(1 for v in state_verdicts if v["verdict"] == "PASS"),
-            sum(1 for v in state_verdicts if v["verdict"] == "WARN"),
-            sum(1 for v in state_verdicts if v["verdict"] == "FAIL"),
+            verdict_counts["PASS"],
+            verdict_counts["WARN"],
+            verdict_counts["FAIL"],
             total_deaths,
             dominant,
             json.dumps(state_verdicts),
@@ -612,6 +615,23 @@ def write_gold(
             conn.close()
 
 
+def _aggregate_by_state(fused_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One vectorized group-by over the fused timeline: per-state row count,
+    mean of every emotion column and of intent_delta, and the modal
+    dominant_emotion (ties → alphabetically first, same as Series.mode()[0]).
+    """
+    emotion_cols = sorted(set(EMOTION_COLUMN_MAP.values()))
+    mean_cols = [c for c in emotion_cols + ["intent_delta"] if c in fused_df.columns]
+    grouped = fused_df.groupby("state")
+    agg = grouped[mean_cols].mean()
+    agg["n_rows"] = grouped.size()
+
+    counts = fused_df.groupby(["state", "dominant_emotion"]).size()
+    agg["dominant_emotion"] = counts.groupby(level=0).idxmax().map(lambda key: key[1])
+    return agg
+
+
 def _build_state_verdicts(
     fused_df: pd.DataFrame,
     dfa_config: Optional[DFAConfig],
@@ -620,39 +640,41 @@ def _build_state_verdicts(
     Group fused_df by state, compute average emotion scores,
     compare against DFA intent, return list of verdict dicts.
     """
+    agg = _aggregate_by_state(fused_df)
+
     if dfa_config is None or not dfa_config.states:
         # No DFA config — just return per-state duration summaries
-        verdicts = []
-        for state_name, group in fused_df.groupby("state"):
-            verdicts.append({
+        return [
+            {
                 "state_name":          str(state_name),
                 "intended_emotion":    "unknown",
                 "intended_score":      0.0,
                 "acceptable_range":    (0.0, 1.0),
                 "actual_avg_score":    0.0,
-                "intent_delta_avg":    float(group["intent_delta"].mean()),
-                "actual_duration_sec": len(group),
+                "intent_delta_avg":    float(row["intent_delta"]),
+                "actual_duration_sec": int(row["n_rows"]),
                 "expected_duration_sec": 0.0,
                 "duration_delta_sec":  0.0,
                 "verdict":             "NO_DATA",
-                "dominant_emotion":    str(group["dominant_emotion"].mode()[0]) if len(group) > 0 else "unknown",
-            })
-        return verdicts
+                "dominant_emotion":    str(row["dominant_emotion"]),
+            }
+            for state_name, row in agg.iterrows()
+        ]
 
     # Build DFA lookup
     dfa_lookup = {s.name: s for s in dfa_config.states}
     verdicts = []
 
-    for state_name, group in fused_df.groupby("state"):
+    for state_name, row in agg.iterrows():
         dfa_state = dfa_lookup.get(str(state_name))
         if dfa_state is None:
             continue  # skip states not in DFA (e.g. 'unknown')
 
         emotion_col = EMOTION_COLUMN_MAP.get(dfa_state.intended_emotion.lower(), "frustration")
         intended_score = (dfa_state.acceptable_range[0] + dfa_state.acceptable_range[1]) / 2.0
-        actual_avg = float(group[emotion_col].mean()) if emotion_col in group.columns else 0.0
-        delta_avg  = float(group["intent_delta"].mean())
-        dom_emotion = str(group["dominant_emotion"].mode()[0]) if len(group) > 0 else "unknown"
+        actual_avg = float(row[emotion_col]) if emotion_col in agg.columns else 0.0
+        delta_avg  = float(row["intent_delta"])
+        n_rows     = int(row["n_rows"])
 
         verdict = _compute_verdict(actual_avg, delta_avg, tuple(dfa_state.acceptable_range))
 
@@ -663,11 +685,11 @@ def _build_state_verdicts(
             "acceptable_range":    tuple(dfa_state.acceptable_range),
             "actual_avg_score":    round(actual_avg, 4),
             "intent_delta_avg":    round(delta_avg, 4),
-            "actual_duration_sec": len(group),
+            "actual_duration_sec": n_rows,
             "expected_duration_sec": dfa_state.expected_duration_sec,
-            "duration_delta_sec":  round(len(group) - dfa_state.expected_duration_sec, 1),
+            "duration_delta_sec":  round(n_rows - dfa_state.expected_duration_sec, 1),
             "verdict":             verdict,
-            "dominant_emotion":    dom_emotion,
+            "dominant_emotion":    str(row["dominant_emotion"]),
         })
 
     return verdicts
@@ -33,6 +33,10 @@ class SphinxClient:
             "project_id": project_id
         }
 
+# sphinx-cli needs a notebook file to write its cells into; keep the scratch
+# notebook on tmpfs when there is one so the round trip never touches disk
+NOTEBOOK_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
 # SF_ACCOUNT   = os.environ.get("SNOWFLAKE_ACCOUNT")
 # SF_USER      = os.environ.get("SNOWFLAKE_USER")
 # SF_PASSWORD  = os.environ.get("SNOWFLAKE_PASSWORD")
@@ -80,7 +84,7 @@ def main():
         return
 
     # Write a minimal valid empty notebook so sphinx-cli can open it
-    with tempfile.NamedTemporaryFile(suffix=".ipynb", delete=False, mode="w") as tmp:
+    with tempfile.NamedTemporaryFile(suffix=".ipynb", delete=False, mode="w", dir=NOTEBOOK_DIR) as tmp:
         json.dump({
             "nbformat": 4,
             "nbformat_minor": 5,
@@ -10,7 +10,7 @@ Tests the full HTTP flow:
   6. GET timeline + verdicts + health score
 
 Run with the server already started:
-  uvicorn main:app --reload --port 8000
+  uvicorn main:app --reload --port 8000 --loop uvloop --http httptools
 
 Then in another terminal:
   python test_e2e.py
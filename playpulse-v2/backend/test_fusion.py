@@ -112,4 +112,23 @@ assert df['frustration'].max() > 0, "Frustration should not be all zero"
 # intent_delta is non-negative
 assert (df['intent_delta'] >= 0).all(), "intent_delta must be non-negative"
 
+# 1 Hz means use compensated summation: a naive running sum of these four frames
+# gives 0.63025000000000001 and rounds to 0.6303 instead of 0.6302
+tie = [{"timestamp": 5 + i / 4, "boredom": b} for i, b in enumerate([0.92, 0.357, 0.664, 0.58])]
+tie_df = fuse_streams(
+    presage_frames=tie, watch_readings=[], chunk_results=[], dfa_config=dfa,
+    session_id='test-session-tie', total_duration_sec=10,
+)
+assert tie_df["boredom"][5] == 0.6302, f"Expected 0.6302, got {tie_df['boredom'][5]}"
+
+# LTTB chart downsampling keeps the endpoints and the spike
+from fusion import downsample_rows
+rows = [{"timestamp_sec": t, "frustration": 0.1, "watch_hr": 70.0} for t in range(1000)]
+rows[437]["frustration"] = 0.95
+thin = downsample_rows(rows, 100)
+assert len(thin) == 100, f"Expected 100 rows, got {len(thin)}"
+assert thin[0] is rows[0] and thin[-1] is rows[-1]
+assert any(r["frustration"] == 0.95 for r in thin), "LTTB must keep the frustration spike"
+assert downsample_rows(rows[:50], 100) == rows[:50]
+
 print("\nfusion.py PASSED ✓")
@@ -0,0 +1,42 @@
+"""Smoke test for models.py — msgspec frames are validated when decoded through msgspec.convert."""
+import sys
+sys.path.insert(0, '.')
+
+from typing import List
+
+import msgspec
+
+from models import EMOTION_KEYS, EmotionFrame, WatchReading
+
+# Well-formed frames convert, ints are widened and unknown fields (gaze, head pose) ignored
+frames = msgspec.convert(
+    [{"timestamp_sec": 1, "frustration": 0.4, "gaze_x": 0.5}, {"timestamp_sec": 1.1, "delight": 0.9}],
+    type=List[EmotionFrame],
+)
+assert frames[0].timestamp_sec == 1.0 and frames[0].frustration == 0.4
+assert frames[1].delight == 0.9 and frames[1].confusion == 0.0
+assert EMOTION_KEYS == ("frustration", "confusion", "delight", "boredom", "surprise", "engagement")
+
+# Malformed frames are rejected: wrong type, missing timestamp, non-numeric score
+for bad in (
+    {"timestamp_sec": 1.0, "delight": "very"},
+    {"frustration": 0.2},
+    {"timestamp_sec": None},
+):
+    try:
+        msgspec.convert([bad], type=List[EmotionFrame])
+    except msgspec.ValidationError as e:
+        print(f"Rejected {bad}: {e}")
+    else:
+        raise AssertionError(f"malformed frame accepted: {bad}")
+
+reading = msgspec.convert({"timestamp_sec": 3.0, "heart_rate": 72}, type=WatchReading)
+assert reading.heart_rate == 72.0 and reading.hrv_rmssd == 0.0
+try:
+    msgspec.convert({"timestamp_sec": 3.0, "heart_rate": "fast"}, type=WatchReading)
+except msgspec.ValidationError:
+    pass
+else:
+    raise AssertionError("malformed watch reading accepted")
+
+print("\nmodels.py PASSED ✓")
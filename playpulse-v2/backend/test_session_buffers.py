@@ -0,0 +1,70 @@
+"""Smoke test for session_buffers.py — windowing, flushing and out-of-order batches."""
+import os
+import sys
+import tempfile
+sys.path.insert(0, '.')
+
+from session_buffers import FLUSH_EVERY, SessionBuffers, WatchBuffer
+
+buf = SessionBuffers()
+
+# 30 seconds at 10 Hz, posted in batches of 25 like the desktop uploader
+frames = [{"timestamp_sec": t / 10.0, "frustration": 0.1, "delight": t / 300.0} for t in range(300)]
+for i in range(0, len(frames), 25):
+    buf.append(frames[i:i + 25])
+
+assert len(buf) == 300
+w = buf.window(10.0, 20.0)
+print(f"Window [10, 20): {len(w)} frames, first={w[0]['timestamp_sec']} last={w[-1]['timestamp_sec']}")
+assert len(w) == 100
+assert w[0]["timestamp_sec"] == 10.0 and w[-1]["timestamp_sec"] == 19.9
+
+# A late batch with earlier timestamps must be merged back into time order
+buf.append([{"timestamp_sec": 5.05, "frustration": 0.9}])
+buf.flush()
+assert (buf.ts[1:] >= buf.ts[:-1]).all(), "timestamps must stay sorted"
+assert len(buf.window(5.0, 5.1)) == 2
+assert buf.scores.shape == (301, 6)
+assert float(buf.scores[-1, 2]) == 299 / 300.0, "scores must round-trip at full float64 precision"
+assert buf.frames[int(buf.ts.searchsorted(5.05))]["frustration"] == 0.9
+
+# Staged frames are flushed once FLUSH_EVERY is reached
+fresh = SessionBuffers()
+fresh.append(frames[:FLUSH_EVERY - 1])
+assert fresh.ts.size == 0
+fresh.append(frames[FLUSH_EVERY - 1:FLUSH_EVERY])
+assert fresh.ts.size == FLUSH_EVERY
+
+# Watch readings land in a memmap that doubles past its initial capacity
+with tempfile.TemporaryDirectory() as spill_dir:
+    watch = WatchBuffer("test-session", capacity=8, spill_dir=spill_dir)
+    assert not os.path.exists(watch.path), "spill file is only created on the first reading"
+    for t in range(20):
+        watch.append({"timestamp_sec": float(t), "heart_rate": 70.0 + t, "hrv_rmssd": 42.0})
+    arr = watch.view()
+    assert len(watch) == 20 and arr.shape == (20,)
+    assert arr["heart_rate"][19] == 89.0 and arr["hrv_sdnn"][0] == 0.0
+    path = watch.path
+    print(f"WatchBuffer: {len(watch)} readings in {path}")
+
+    # close() deletes the backing file but keeps the readings readable (and appendable)
+    watch.close()
+    watch.close()
+    assert not os.path.exists(path) and watch.path is None
+    assert len(watch) == 20 and watch.view()["heart_rate"][19] == 89.0
+    watch.append({"timestamp_sec": 20.0, "heart_rate": 90.0})
+    assert len(watch) == 21 and watch.view()["heart_rate"][20] == 90.0
+
+    # Readings are kept at full float64 precision, like the baseline list of dicts
+    exact = WatchBuffer("test-exact", spill_dir=spill_dir)
+    exact.append({"timestamp_sec": 0.0, "heart_rate": 72.3, "movement_variance": 0.0123})
+    assert exact.view()["heart_rate"][0] == 72.3 and exact.view()["movement_variance"][0] == 0.0123
+    exact.close()
+
+    # A session that never receives a reading has nothing to clean up
+    empty = WatchBuffer("test-empty", spill_dir=spill_dir)
+    empty.close()
+    assert len(empty) == 0 and empty.view().shape == (0,)
+    assert os.listdir(spill_dir) == []
+
+print("\nsession_buffers.py PASSED ✓")
@@ -1,33 +1,52 @@
 """
 VectorAI client — stores and queries window embeddings via Actian VectorAI.
 
-Uses the REST API for upsert/search/delete operations.
-Falls back to persistent JSON file when credentials are missing.
+Uses the REST API for upsert/search/delete operations over one pooled
+keep-alive httpx client; large upserts are split into batches sent
+concurrently. Falls back to persistent JSON file when credentials are missing;
+once the fallback store is large, local search goes through an in-memory
+USearch HNSW index instead of a linear cosine scan.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import math
 import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import httpx
+import numpy as np
+import orjson
 
 from config import VECTORAI_URL, VECTORAI_API_KEY, VECTORAI_COLLECTION
 
+try:
+    from usearch.index import Index as HNSWIndex
+except ImportError:
+    HNSWIndex = None
+
 logger = logging.getLogger(__name__)
 
 _STORAGE_PATH = Path(__file__).parent / "vectorai_fallback.json"
 
+UPSERT_BATCH_SIZE = 256
+
+# Local HNSW search over the fallback store
+HNSW_MIN_VECTORS = 1024     # below this a linear scan beats building the graph
+HNSW_OVERFETCH = 4          # extra candidates pulled when filters are applied afterwards
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60.0)
+
 
 class VectorAIClient:
     """Actian VectorAI REST client with persistent JSON fallback."""
 
     def __init__(self):
         self._http: Optional[httpx.AsyncClient] = None
+        self._collection_ready = False
+        self._matrix = None  # (dim, row ids, (N, D) float64 vectors, norms) cached from self._store
+        self._hnsw = None    # (Index, entries) built lazily from self._store
         self._load_fallback()
 
     def _use_real(self) -> bool:
@@ -38,17 +57,20 @@ class VectorAIClient:
         self._store: List[Dict] = []
         if _STORAGE_PATH.exists():
             try:
-                with open(_STORAGE_PATH, "r") as f:
-                    self._store = json.load(f)
+                with open(_STORAGE_PATH, "rb") as f:
+                    self._store = orjson.loads(f.read())
                 logger.info(f"[vectorai][fallback] Loaded {len(self._store)} embeddings from {_STORAGE_PATH}")
             except Exception as exc:
                 logger.warning(f"[vectorai][fallback] Could not load {_STORAGE_PATH}: {exc}")
 
     def _save_fallback(self):
         """Save embeddings to JSON file."""
+        # Store changed — rebuild the cached matrix / local index on next search
+        self._matrix = None
+        self._hnsw = None
         try:
-            with open(_STORAGE_PATH, "w") as f:
-                json.dump(self._store, f, indent=2)
+            with open(_STORAGE_PATH, "wb") as f:
+                f.write(orjson.dumps(self._store, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
             logger.debug(f"[vectorai][fallback] Saved {len(self._store)} embeddings to {_STORAGE_PATH}")
         except Exception as exc:
             logger.error(f"[vectorai][fallback] Could not save {_STORAGE_PATH}: {exc}")
@@ -62,11 +84,14 @@ class VectorAIClient:
                     "Content-Type": "application/json",
                 },
                 timeout=30.0,
+                limits=_HTTP_LIMITS,
             )
         return self._http
 
     async def _ensure_collection(self):
-        """Create the collection if it doesn't exist."""
+        """Create the collection if it doesn't exist. Checked once per process."""
+        if self._collection_ready:
+            return
         client = self._get_http()
         try:
             resp = await client.get(f"/collections/{VECTORAI_COLLECTION}")
@@ -77,6 +102,7 @@ class VectorAIClient:
                     "distance": "cosine",
                 })
                 logger.info(f"[vectorai] Created collection: {VECTORAI_COLLECTION}")
+            self._collection_ready = True
         except Exception as exc:
             logger.warning(f"[vectorai] ensure_collection check failed: {exc}")
 
@@ -108,12 +134,19 @@ class VectorAIClient:
                 "metadata": emb.get("metadata", {}),
             })
 
-        try:
+        async def _post_batch(batch: List[Dict]):
             resp = await client.post(
                 f"/collections/{VECTORAI_COLLECTION}/points",
-                json={"points": points},
+                content=orjson.dumps({"points": batch}, option=orjson.OPT_SERIALIZE_NUMPY),
             )
             resp.raise_for_status()
+
+        try:
+            # Batches go out concurrently over the pooled keep-alive connections
+            await asyncio.gather(*(
+                _post_batch(points[i:i + UPSERT_BATCH_SIZE])
+                for i in range(0, len(points), UPSERT_BATCH_SIZE)
+            ))
             logger.info(f"[vectorai] Upserted {len(points)} points to {VECTORAI_COLLECTION}")
             return len(points)
         except httpx.HTTPStatusError as exc:
@@ -153,7 +186,7 @@ class VectorAIClient:
         try:
             resp = await client.post(
                 f"/collections/{VECTORAI_COLLECTION}/search",
-                json=payload,
+                content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
             )
             resp.raise_for_status()
             data = resp.json()
@@ -196,34 +229,101 @@ class VectorAIClient:
             self._save_fallback()
             return before - len(self._store)
 
-    def _search_mem(
+    def _vector_matrix(self):
+        """Cache the fallback store as one (N, D) float64 matrix plus row norms.
+
+        Only vectors matching the first entry's dimensionality are included;
+        the rest keep scoring 0.0, as the scalar cosine did.
+        """
+        if self._matrix is None:
+            dim = len(self._store[0]["vector"]) if self._store else 0
+            rows = np.array(
+                [i for i, e in enumerate(self._store) if len(e["vector"]) == dim], dtype=np.intp,
+            )
+            mat = np.asarray(
+                [self._store[i]["vector"] for i in rows], dtype=np.float64,
+            ).reshape(len(rows), dim)
+            self._matrix = (dim, rows, mat, np.linalg.norm(mat, axis=1))
+        return self._matrix
+
+    def _hnsw_index(self):
+        """Build (once per store change) an HNSW graph over the fallback embeddings."""
+        if self._hnsw is None:
+            dim, rows, mat, _ = self._vector_matrix()
+            entries = [self._store[i] for i in rows]
+            index = HNSWIndex(
+                ndim=dim, metric="cos", dtype="f32",
+                connectivity=24, expansion_add=128, expansion_search=100,
+            )
+            index.add(np.arange(len(entries), dtype=np.uint64), mat.astype(np.float32))
+            self._hnsw = (index, entries)
+            logger.info(f"[vectorai][fallback] Built HNSW index over {len(entries)} embeddings")
+        return self._hnsw
+
+    def _search_hnsw(
         self,
         query_vector: List[float],
         top_k: int,
         filters: Optional[Dict[str, Any]],
-    ) -> List[Dict]:
-        """In-memory cosine similarity search."""
+    ) -> Optional[List[Dict]]:
+        """Approximate search via the local HNSW index; None if it can't answer."""
+        index, entries = self._hnsw_index()
+        if len(query_vector) != index.ndim:
+            return None
+        k = min(len(entries), top_k * HNSW_OVERFETCH if filters else top_k)
+        matches = index.search(np.asarray(query_vector, dtype=np.float32), k)
         results = []
-        for entry in self._store:
+        for key, dist in zip(matches.keys, matches.distances):
+            entry = entries[int(key)]
             if filters:
                 meta = entry.get("metadata", {})
-                if not all(meta.get(k) == v for k, v in filters.items()):
+                if not all(meta.get(f) == v for f, v in filters.items()):
                     continue
-            score = _cosine_sim(query_vector, entry["vector"])
-            results.append({**entry, "score": round(score, 6)})
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:top_k]
+            results.append({**entry, "score": round(1.0 - float(dist), 6)})
+            if len(results) == top_k:
+                return results
+        # Filters rejected too many candidates — let the exact scan answer
+        return results if not filters else None
+
+    def _search_mem(
+        self,
+        query_vector: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> List[Dict]:
+        """In-memory cosine similarity search."""
+        if HNSWIndex is not None and len(self._store) >= HNSW_MIN_VECTORS:
+            results = self._search_hnsw(query_vector, top_k, filters)
+            if results is not None:
+                return results
+
+        if not self._store or top_k <= 0:
+            return []
+
+        # Exact scan: one BLAS mat-vec over the cached matrix
+        dim, rows, mat, norms = self._vector_matrix()
+        scores = np.zeros(len(self._store), dtype=np.float64)
+        q = np.asarray(query_vector, dtype=np.float64)
+        q_norm = float(np.linalg.norm(q)) if q.size else 0.0
+        if q.size == dim and q_norm > 0 and len(rows):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sims = (mat @ q) / (norms * q_norm)
+            scores[rows] = np.where(norms > 0, sims, 0.0)
+
+        if filters:
+            candidates = np.array([
+                i for i, e in enumerate(self._store)
+                if all(e.get("metadata", {}).get(k) == v for k, v in filters.items())
+            ], dtype=np.intp)
+        else:
+            candidates = np.arange(len(self._store))
+        if len(candidates) > top_k:
+            # O(N) selection of the top_k, then sort only those (stable → insertion order on ties)
+            best = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = np.sort(candidates[best])
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [{**self._store[i], "score": round(float(scores[i]), 6)} for i in order]
 
     def is_configured(self) -> bool:
         return bool(VECTORAI_URL and VECTORAI_API_KEY)
 
-
-def _cosine_sim(a: List[float], b: List[float]) -> float:
-    if len(a) != len(b) or not a:
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    mag_a = math.sqrt(sum(x * x for x in a))
-    mag_b = math.sqrt(sum(y * y for y in b))
-    if mag_a == 0 or mag_b == 0:
-        return 0.0
-    return dot / (mag_a * mag_b)
@@ -5,7 +5,8 @@ and the session-level Playtest Health Score.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
 
 from models import DFAState, FusedRow, StateVerdict
 
@@ -13,12 +14,27 @@ from models import DFAState, FusedRow, StateVerdict
 EMOTION_KEYS = ["frustration", "confusion", "delight", "boredom", "surprise"]
 
 
-def compute_verdict(fused_rows: List[FusedRow], state_config: DFAState) -> StateVerdict:
+def group_rows_by_state(fused_rows: List[FusedRow]) -> Dict[str, List[FusedRow]]:
+    """Bucket fused rows by DFA state in a single pass over the timeline."""
+    groups: Dict[str, List[FusedRow]] = defaultdict(list)
+    for r in fused_rows:
+        groups[r.current_state].append(r)
+    return groups
+
+
+def compute_verdict(
+    fused_rows: List[FusedRow],
+    state_config: DFAState,
+    rows_by_state: Optional[Dict[str, List[FusedRow]]] = None,
+) -> StateVerdict:
     """Compute a verdict for a single DFA state.
 
     Compares the average score of the *intended* emotion against the
     developer-defined acceptable range, then checks whether a different
     emotion dominated instead.
+
+    Pass ``rows_by_state`` from group_rows_by_state() when scoring many
+    states so the timeline is not rescanned once per state.
     """
     state_name = state_config.name
     intended = state_config.intended_emotion
@@ -26,7 +42,10 @@ def compute_verdict(fused_rows: List[FusedRow], state_config: DFAState) -> State
     expected_dur = state_config.expected_duration_sec
 
     # Filter rows belonging to this state
-    state_rows = [r for r in fused_rows if r.current_state == state_name]
+    if rows_by_state is not None:
+        state_rows = rows_by_state.get(state_name, [])
+    else:
+        state_rows = [r for r in fused_rows if r.current_state == state_name]
 
     if not state_rows:
         return StateVerdict(
@@ -37,11 +56,14 @@ def compute_verdict(fused_rows: List[FusedRow], state_config: DFAState) -> State
             verdict="NO_DATA",
         )
 
-    # Average each emotion across the state
-    emotion_avgs: Dict[str, float] = {}
-    for key in EMOTION_KEYS:
-        vals = [getattr(r, key) for r in state_rows]
-        emotion_avgs[key] = sum(vals) / len(vals) if vals else 0.0
+    # Average each emotion across the state — one pass over the rows for all keys
+    sums = [0.0] * len(EMOTION_KEYS)
+    for r in state_rows:
+        for i, key in enumerate(EMOTION_KEYS):
+            sums[i] += getattr(r, key)
+    emotion_avgs: Dict[str, float] = {
+        key: total / len(state_rows) for key, total in zip(EMOTION_KEYS, sums)
+    }
 
     # Map intended emotion name to key (handle aliases)
     intended_key = _resolve_emotion_key(intended)
@@ -21,6 +21,11 @@ from typing import Any, Callable, Dict, List, Optional
 
 import requests
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 
 class ChunkUploader:
     """Manages async upload of data streams to the AURA backend."""
@@ -300,7 +305,10 @@ class ChunkUploader:
 
             if ws:
                 try:
-                    ws.send(json.dumps(item))
+                    if msgpack is not None:
+                        ws.send_binary(msgpack.packb(item, use_bin_type=True))
+                    else:
+                        ws.send(json.dumps(item))
                     self.watch_readings_sent += 1
                 except Exception:
                     ws = None  # Fall through to REST
@@ -11,12 +11,27 @@ End-to-end test for the Gemini Vision pipeline.
 """
 import io
 import json
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image, ImageDraw, ImageFont
+from PIL import __version__ as PIL_VERSION
 
 BACKEND = "http://localhost:8000"
+UPLOAD_WORKERS = 6
+
+# Shared keep-alive pool so parallel chunk uploads reuse TCP connections
+http = requests.Session()
+http.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# Fast-encode JPEG settings: no Huffman optimisation pass, baseline scan, 4:2:0 chroma
+JPEG_FAST = dict(optimize=False, progressive=False, subsampling=2)
+
+# pillow-simd publishes versions like "9.5.0.post1"; stock Pillow never does.
+PILLOW_SIMD = ".post" in PIL_VERSION
 
 # ── Mario DFA config ─────────────────────────────────────────
 DFA_STATES = [
@@ -57,7 +72,7 @@ def grab_screenshot():
             img = Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
             img = img.resize((1280, int(img.height * 1280 / img.width)), Image.LANCZOS)
             buf = io.BytesIO()
-            img.save(buf, format="JPEG", quality=70)
+            img.save(buf, format="JPEG", quality=70, **JPEG_FAST)
             print(f"  [screenshot] Real screenshot captured ({img.width}x{img.height})")
             return buf.getvalue()
     except Exception as e:
@@ -81,48 +96,82 @@ def make_test_frame(label="Test Frame"):
         draw.text((x + 10, 308), "?", fill=(0, 0, 0))
     draw.text((10, 10), label, fill=(255, 255, 255))
     buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=80)
+    img.save(buf, format="JPEG", quality=60, **JPEG_FAST)
     print(f"  [screenshot] Generated test frame '{label}'")
     return buf.getvalue()
 
 
+def retry(fn, max_retries=3, base=1.0, cap=30.0, jitter=0.5):
+    """Call fn(), retrying connection errors, timeouts and 5xx with jittered exponential backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            resp = fn()
+            if resp.status_code < 500 or attempt == max_retries:
+                return resp
+            print(f"  [retry] HTTP {resp.status_code}, attempt {attempt + 1}/{max_retries}")
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == max_retries:
+                raise
+            print(f"  [retry] {type(e).__name__}, attempt {attempt + 1}/{max_retries}")
+        time.sleep(min(cap, base * 2 ** attempt) * (1 + random.uniform(-jitter, jitter)))
+
+
 def upload_frames(session_id, chunk_index, frame_bytes_list):
     timestamps = json.dumps([round(i * 0.5, 1) for i in range(len(frame_bytes_list))])
     files = [
         ("frames", (f"frame_{i:04d}.jpg", data, "image/jpeg"))
         for i, data in enumerate(frame_bytes_list)
     ]
-    resp = requests.post(
+    resp = retry(lambda: http.post(
         f"{BACKEND}/v1/sessions/{session_id}/upload-frames",
         data={"chunk_index": str(chunk_index), "timestamps": timestamps},
         files=files,
         timeout=30,
-    )
+    ))
     resp.raise_for_status()
     return resp.json()
 
 
+def upload_chunks(session_id, chunks):
+    """Upload several chunks concurrently. `chunks` maps chunk_index → [frame bytes]."""
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, max(len(chunks), 1))) as pool:
+        futures = {
+            idx: pool.submit(upload_frames, session_id, idx, frames)
+            for idx, frames in chunks.items()
+        }
+        return {idx: f.result() for idx, f in futures.items()}
+
+
 def wait_for_chunk(session_id, chunk_index, timeout=30):
-    """Poll until the chunk appears in /chunks (means Gemini finished)."""
+    """Long-poll /chunks/{idx}?wait= until Gemini finishes the chunk."""
     deadline = time.time() + timeout
-    while time.time() < deadline:
-        resp = requests.get(f"{BACKEND}/v1/sessions/{session_id}/chunks")
-        chunks = resp.json().get("chunks", [])
-        for c in chunks:
-            if c["chunk_index"] == chunk_index:
-                return c
-        time.sleep(1)
+    backoff = 1.0
+    while (remaining := deadline - time.time()) > 0:
+        wait = min(remaining, 30)
+        started = time.time()
+        resp = retry(lambda: http.get(
+            f"{BACKEND}/v1/sessions/{session_id}/chunks/{chunk_index}",
+            params={"wait": round(wait, 1)},
+            timeout=wait + 5,
+        ))
+        if resp.status_code == 200:
+            return resp.json()
+        # Server answered without holding the request — back off before asking again
+        if time.time() - started < wait / 2:
+            time.sleep(min(backoff, max(deadline - time.time(), 0)))
+            backoff = min(backoff * 2, 8.0)
     return None
 
 
 def main():
     print("=" * 60)
     print("AURA — Gemini Vision Pipeline Test")
+    print(f"Pillow {PIL_VERSION}{' (SIMD)' if PILLOW_SIMD else ''}")
     print("=" * 60)
 
     # ── 1. Create project ───────────────────────────────────────
     print("\n[1/6] Creating Mario 1-1 project...")
-    resp = requests.post(
+    resp = http.post(
         f"{BACKEND}/v1/projects",
         json={
             "name": "Mario 1-1 Playtest",
@@ -141,7 +190,7 @@ def main():
 
     # ── 2. Create session ───────────────────────────────────────
     print("\n[2/6] Creating session...")
-    resp = requests.post(
+    resp = http.post(
         f"{BACKEND}/v1/projects/{project_id}/sessions",
         json={"tester_name": "test_runner", "chunk_duration_sec": 15},
         timeout=10,
@@ -158,7 +207,7 @@ def main():
 
     # ── 4. Upload frames ────────────────────────────────────────
     print("\n[4/6] Uploading 3 frames to /upload-frames (chunk 0)...")
-    result = upload_frames(session_id, chunk_index=0, frame_bytes_list=[frame1, frame2, frame3])
+    result = upload_chunks(session_id, {0: [frame1, frame2, frame3]})[0]
     print(f"  response: {result}")
 
     # ── 5. Wait for Gemini to process ───────────────────────────
@@ -185,14 +234,14 @@ def main():
 
     # ── 6. Finalize session ─────────────────────────────────────
     print("\n[6/6] Finalizing session...")
-    resp = requests.post(f"{BACKEND}/v1/sessions/{session_id}/finalize", timeout=60)
+    resp = http.post(f"{BACKEND}/v1/sessions/{session_id}/finalize", timeout=60)
     resp.raise_for_status()
     final = resp.json()
     print(f"  health_score:   {final.get('health_score', '?')}")
     print(f"  verdicts_count: {final.get('verdicts_count', '?')}")
 
     # Print verdicts
-    resp = requests.get(f"{BACKEND}/v1/sessions/{session_id}/verdicts")
+    resp = http.get(f"{BACKEND}/v1/sessions/{session_id}/verdicts")
     verdicts = resp.json().get("verdicts", [])
     print(f"\n  ── Verdicts ────────────────────────────────────────")
     for v in verdicts:
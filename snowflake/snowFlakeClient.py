@@ -1,10 +1,154 @@
-import json
+import io
 import os
-from typing import Optional
+import queue
+import threading
+import time
+import uuid
+from typing import Iterator, Optional
 
+import orjson
 import snowflake.connector
 from snowflake.connector import DictCursor
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Batches at least this large go through PUT + COPY INTO instead of executemany
+BULK_LOAD_MIN_ROWS = 1000
+_STAGE = "@~/playpulse_bulk"
+
+# INSERT statements are built once at import rather than per call
+_SQL_PRESAGE = """
+    INSERT INTO bronze_presage_emotions
+        (session_id, project_id, recorded_at,
+         frustration, confusion, delight, boredom, surprise, engagement,
+         camera_hr, camera_br, raw_payload)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, PARSE_JSON(%s))
+"""
+
+_SQL_GEMINI_CHUNK = """
+    INSERT INTO bronze_gemini_chunks
+        (session_id, project_id, chunk_index, chunk_start_sec, chunk_end_sec,
+         dfa_state, transitions, events, behavior, summary, raw_payload)
+    VALUES (%s, %s, %s, %s, %s, %s,
+            PARSE_JSON(%s), PARSE_JSON(%s),
+            %s, %s, PARSE_JSON(%s))
+"""
+
+_SQL_WATCH = """
+    INSERT INTO bronze_watch_biometrics
+        (session_id, project_id, recorded_at, heart_rate, hrv, raw_payload)
+    VALUES (%s, %s, %s, %s, %s, PARSE_JSON(%s))
+"""
+
+_FUSED_COLUMNS = (
+    "session_id", "project_id", "t_second", "dfa_state",
+    "frustration", "confusion", "delight", "boredom", "surprise", "engagement",
+    "camera_hr", "watch_hr", "watch_hrv", "data_quality",
+)
+_SQL_FUSED = (
+    f"INSERT INTO silver_fused_timeline ({', '.join(_FUSED_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(_FUSED_COLUMNS))})"
+)
+
+_SQL_STATE_VERDICTS = """
+    INSERT INTO gold_state_verdicts
+        (session_id, project_id, dfa_state,
+         intended_emotion, actual_emotion,
+         intended_score_avg, acceptable_min, acceptable_max,
+         verdict, deviation_score,
+         actual_duration_sec, expected_duration_sec, time_delta_sec)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_SQL_SESSION_HEALTH = """
+    INSERT INTO gold_session_health
+        (session_id, project_id, tester_id, health_score,
+         pass_count, warn_count, fail_count, total_duration_sec)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_SQL_GET_FUSED = "SELECT * FROM silver_fused_timeline WHERE session_id = %s ORDER BY t_second"
+
+_SQL_GET_HEATMAP = """
+    SELECT dfa_state, avg_frustration, avg_heart_rate,
+           pass_rate, fail_rate, num_sessions
+    FROM gold_cross_session_aggregates
+    WHERE project_id = %s
+    ORDER BY avg_frustration DESC
+"""
+
+# Idle connections kept per distinct set of connection params
+POOL_SIZE = 4
+_POOLS: dict[tuple, queue.Queue] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool_for(conn_params: dict) -> queue.Queue:
+    key = tuple(sorted((k, v) for k, v in conn_params.items() if isinstance(v, str)))
+    with _POOLS_LOCK:
+        return _POOLS.setdefault(key, queue.Queue(maxsize=POOL_SIZE))
+
+
+# Dashboard read cache: (scope, kind, session_id | project_id) -> (expires_at, rows),
+# where scope identifies the account/database the rows were read from
+READ_CACHE_TTL_SEC = 15.0
+READ_CACHE_MAX_ENTRIES = 1024
+_READ_CACHE: dict[tuple, tuple[float, tuple]] = {}
+_READ_CACHE_LOCK = threading.Lock()
+
+
+def _cached_read(scope: tuple, kind: str, key: str, load) -> list[dict]:
+    """Rows from the cache (or load()), copied so callers can't mutate the cached entry."""
+    now = time.monotonic()
+    with _READ_CACHE_LOCK:
+        hit = _READ_CACHE.get((scope, kind, key))
+    if hit and hit[0] > now:
+        rows = hit[1]
+    else:
+        rows = tuple(load())
+        with _READ_CACHE_LOCK:
+            if len(_READ_CACHE) >= READ_CACHE_MAX_ENTRIES:
+                for k in [k for k, (exp, _) in _READ_CACHE.items() if exp <= now] or list(_READ_CACHE)[:1]:
+                    del _READ_CACHE[k]
+            _READ_CACHE[(scope, kind, key)] = (now + READ_CACHE_TTL_SEC, rows)
+    return [dict(row) for row in rows]
+
+
+def _invalidate(scope: tuple, kind: str, key: str):
+    with _READ_CACHE_LOCK:
+        _READ_CACHE.pop((scope, kind, key), None)
+
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _split_raw(readings: list) -> tuple[list[dict], list[str]]:
+    """Readings may be dicts or (dict, original JSON bytes) pairs; reuse the bytes as raw_payload."""
+    dicts, payloads = [], []
+    for item in readings:
+        r, raw = item if isinstance(item, tuple) else (item, None)
+        dicts.append(r)
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode()
+        payloads.append(raw or _dumps(r))
+    return dicts, payloads
+
+
+def _struct_array(values: list):
+    """Arrow struct column for VARIANT payload dicts, or None if they don't share a usable schema."""
+    if not values or not all(isinstance(v, dict) for v in values):
+        return None
+    try:
+        arr = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    return arr if pa.types.is_struct(arr.type) and arr.type.num_fields else None
+
 
 class SnowflakeClient:
     def __init__(
@@ -24,19 +168,42 @@ class SnowflakeClient:
             "database":  database  or os.environ.get("SNOWFLAKE_DATABASE", "PATCHLAB_DB"),
             "schema":    schema    or os.environ.get("SNOWFLAKE_SCHEMA",   "PATCHLAB_SCHEMA"),
             "warehouse": warehouse or os.environ.get("SNOWFLAKE_WAREHOUSE", "PATCHLAB_WH"),
+            "client_session_keep_alive": True,
+            "session_parameters": {"QUERY_TAG": "playpulse"},
         }
         resolved_role = role or os.environ.get("SNOWFLAKE_ROLE")
         if resolved_role:
             self._conn_params["role"] = resolved_role
+        self._cache_scope = tuple(
+            self._conn_params.get(k) for k in ("account", "user", "database", "schema", "role")
+        )
         self._conn = None
+        self._cur = None
 
     def connect(self) -> "SnowflakeClient":
-        self._conn = snowflake.connector.connect(**self._conn_params)
+        """Check out a live pooled connection, opening a new one if the pool is empty."""
+        pool = _pool_for(self._conn_params)
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                conn = snowflake.connector.connect(**self._conn_params)
+                break
+            if not conn.is_closed():
+                break
+        self._conn = conn
         return self
 
     def close(self):
+        """Return the connection to the pool; only really close it if the pool is full."""
+        if self._cur:
+            self._cur.close()
+            self._cur = None
         if self._conn:
-            self._conn.close()
+            try:
+                _pool_for(self._conn_params).put_nowait(self._conn)
+            except queue.Full:
+                self._conn.close()
             self._conn = None
 
     def __enter__(self) -> "SnowflakeClient":
@@ -45,19 +212,63 @@ class SnowflakeClient:
     def __exit__(self, *_):
         self.close()
 
+    def _cursor(self):
+        # One DictCursor reused for every statement while the connection is checked out
+        if self._cur is None:
+            self._cur = self._conn.cursor(DictCursor)
+        return self._cur
+
     def _execute(self, sql: str, params=None, fetch: bool = False):
-        cur = self._conn.cursor(DictCursor)
+        cur = self._cursor()
         cur.execute(sql, params)
         if fetch:
-            rows = cur.fetchall()
+            return cur.fetchall()
+
+    def _execute_iter(self, sql: str, params=None):
+        """Yield result rows as the connector fetches them instead of materializing fetchall()."""
+        # Own cursor: the shared one may be reused while the caller is still consuming rows
+        cur = self._conn.cursor(DictCursor)
+        try:
+            cur.execute(sql, params)
+            yield from cur
+        finally:
             cur.close()
-            return rows
-        cur.close()
 
     def _executemany(self, sql: str, rows: list):
-        cur = self._conn.cursor()
-        cur.executemany(sql, rows)
-        cur.close()
+        self._cursor().executemany(sql, rows)
+
+    def _bulk_load(self, table: str, columns: dict[str, list], variant_columns: tuple = ()):
+        """Stream the columns to the user stage as one Parquet file and COPY it into table."""
+        arrays, select = {}, []
+        for c, values in columns.items():
+            if c in variant_columns:
+                struct = _struct_array(values)
+                if struct is not None:
+                    # Parquet struct lands in the VARIANT as an OBJECT — no per-row JSON parse
+                    arrays[c] = struct
+                    select.append(f"$1:{c}")
+                    continue
+                values = [v if isinstance(v, str) else _dumps(v) for v in values]
+                select.append(f"PARSE_JSON($1:{c}::STRING)")
+            else:
+                select.append(f"$1:{c}")
+            arrays[c] = values
+
+        buf = io.BytesIO()
+        pq.write_table(pa.table(arrays), buf)
+        buf.seek(0)
+        name = f"{table}_{uuid.uuid4().hex}.parquet"
+        select = ", ".join(select)
+        cur = self._cursor()
+        cur.execute(f"PUT file://{name} {_STAGE} AUTO_COMPRESS=FALSE", file_stream=buf)
+        cur.execute(
+            f"COPY INTO {table} ({', '.join(columns)}) "
+            f"FROM (SELECT {select} FROM {_STAGE}/{name}) "
+            f"FILE_FORMAT = (TYPE = PARQUET) PURGE = TRUE"
+        )
+
+    def _use_bulk_load(self, n_rows: int) -> bool:
+        return pa is not None and n_rows >= BULK_LOAD_MIN_ROWS
 
     def create_schema(self):
         statements = [
@@ -126,7 +337,7 @@ class SnowflakeClient:
                 watch_hrv    FLOAT,
                 data_quality FLOAT,
                 created_at   TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
-            )
+            ) CLUSTER BY (session_id, t_second)
             """,
             """
             CREATE TABLE IF NOT EXISTS gold_state_verdicts (
@@ -145,7 +356,7 @@ class SnowflakeClient:
                 expected_duration_sec FLOAT,
                 time_delta_sec        FLOAT,
                 computed_at           TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
-            )
+            ) CLUSTER BY (session_id)
             """,
             """
             CREATE TABLE IF NOT EXISTS gold_session_health (
@@ -175,95 +386,108 @@ class SnowflakeClient:
                 fail_rate          FLOAT,
                 avg_time_delta_sec FLOAT,
                 computed_at        TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
-            )
+            ) CLUSTER BY (project_id, dfa_state)
             """,
         ]
+        # Submit every DDL at once so the round trips overlap, then wait for all of them
+        cur = self._cursor()
+        qids = []
         for stmt in statements:
-            self._execute(stmt)
-
-    def insert_presage_batch(self, session_id: str, project_id: str, readings: list[dict]):
-        sql = """
-            INSERT INTO bronze_presage_emotions
-                (session_id, project_id, recorded_at,
-                 frustration, confusion, delight, boredom, surprise, engagement,
-                 camera_hr, camera_br, raw_payload)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, PARSE_JSON(%s))
-        """
+            cur.execute_async(stmt)
+            qids.append(cur.sfqid)
+        for qid in qids:
+            while self._conn.is_still_running(self._conn.get_query_status_throw(qid)):
+                time.sleep(0.05)
+        # Point lookups by session_id; search optimization needs Enterprise edition, so best effort
+        for table in ("silver_fused_timeline", "gold_state_verdicts"):
+            try:
+                self._execute(f"ALTER TABLE {table} ADD SEARCH OPTIMIZATION ON EQUALITY(session_id)")
+            except snowflake.connector.errors.ProgrammingError:
+                pass
+
+    def insert_presage_batch(self, session_id: str, project_id: str, readings: list):
+        if self._use_bulk_load(len(readings)):
+            readings = [item[0] if isinstance(item, tuple) else item for item in readings]
+            n = len(readings)
+            columns = {
+                "session_id":  [session_id] * n,
+                "project_id":  [project_id] * n,
+                "recorded_at": [r["recorded_at"] for r in readings],
+            }
+            for key in ("frustration", "confusion", "delight", "boredom", "surprise",
+                        "engagement", "camera_hr", "camera_br"):
+                columns[key] = [r.get(key) for r in readings]
+            columns["raw_payload"] = readings
+            self._bulk_load("bronze_presage_emotions", columns, variant_columns=("raw_payload",))
+            return
+
+        readings, payloads = _split_raw(readings)
+
         rows = [
             (
                 session_id, project_id, r["recorded_at"],
                 r.get("frustration"), r.get("confusion"), r.get("delight"),
                 r.get("boredom"), r.get("surprise"), r.get("engagement"),
-                r.get("camera_hr"), r.get("camera_br"), json.dumps(r),
+                r.get("camera_hr"), r.get("camera_br"), raw,
             )
-            for r in readings
+            for r, raw in zip(readings, payloads)
         ]
-        self._executemany(sql, rows)
+        self._executemany(_SQL_PRESAGE, rows)
 
     def insert_gemini_chunk(self, session_id: str, project_id: str, chunk: dict):
-        sql = """
-            INSERT INTO bronze_gemini_chunks
-                (session_id, project_id, chunk_index, chunk_start_sec, chunk_end_sec,
-                 dfa_state, transitions, events, behavior, summary, raw_payload)
-            VALUES (%s, %s, %s, %s, %s, %s,
-                    PARSE_JSON(%s), PARSE_JSON(%s),
-                    %s, %s, PARSE_JSON(%s))
-        """
-        self._execute(sql, (
+        self._execute(_SQL_GEMINI_CHUNK, (
             session_id, project_id,
             chunk["chunk_index"], chunk["chunk_start_sec"], chunk["chunk_end_sec"],
             chunk.get("dfa_state"),
-            json.dumps(chunk.get("transitions", [])),
-            json.dumps(chunk.get("events", [])),
+            _dumps(chunk.get("transitions", [])),
+            _dumps(chunk.get("events", [])),
             chunk.get("behavior"), chunk.get("summary"),
-            json.dumps(chunk),
+            _dumps(chunk),
         ))
 
-    def insert_watch_batch(self, session_id: str, project_id: str, readings: list[dict]):
-        sql = """
-            INSERT INTO bronze_watch_biometrics
-                (session_id, project_id, recorded_at, heart_rate, hrv, raw_payload)
-            VALUES (%s, %s, %s, %s, %s, PARSE_JSON(%s))
-        """
+    def insert_watch_batch(self, session_id: str, project_id: str, readings: list):
+        if self._use_bulk_load(len(readings)):
+            readings = [item[0] if isinstance(item, tuple) else item for item in readings]
+            n = len(readings)
+            self._bulk_load("bronze_watch_biometrics", {
+                "session_id":  [session_id] * n,
+                "project_id":  [project_id] * n,
+                "recorded_at": [r["recorded_at"] for r in readings],
+                "heart_rate":  [r.get("heart_rate") for r in readings],
+                "hrv":         [r.get("hrv") for r in readings],
+                "raw_payload": readings,
+            }, variant_columns=("raw_payload",))
+            return
+
+        readings, payloads = _split_raw(readings)
+
         rows = [
             (
                 session_id, project_id, r["recorded_at"],
-                r.get("heart_rate"), r.get("hrv"), json.dumps(r),
+                r.get("heart_rate"), r.get("hrv"), raw,
             )
-            for r in readings
+            for r, raw in zip(readings, payloads)
         ]
-        self._executemany(sql, rows)
+        self._executemany(_SQL_WATCH, rows)
 
     def insert_fused_timeline(self, session_id: str, project_id: str, rows: list[dict]):
-        sql = """
-            INSERT INTO silver_fused_timeline
-                (session_id, project_id, t_second, dfa_state,
-                 frustration, confusion, delight, boredom, surprise, engagement,
-                 camera_hr, watch_hr, watch_hrv, data_quality)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        data = [
-            (
-                session_id, project_id, r["t_second"], r.get("dfa_state"),
-                r.get("frustration"), r.get("confusion"), r.get("delight"),
-                r.get("boredom"), r.get("surprise"), r.get("engagement"),
-                r.get("camera_hr"), r.get("watch_hr"), r.get("watch_hrv"),
-                r.get("data_quality", 1.0),
-            )
-            for r in rows
-        ]
-        self._executemany(sql, data)
+        n = len(rows)
+        columns = {
+            "session_id": [session_id] * n,
+            "project_id": [project_id] * n,
+            "t_second":   [r["t_second"] for r in rows],
+        }
+        for key in _FUSED_COLUMNS[3:-1]:
+            columns[key] = [r.get(key) for r in rows]
+        columns["data_quality"] = [r.get("data_quality", 1.0) for r in rows]
+
+        if self._use_bulk_load(n):
+            self._bulk_load("silver_fused_timeline", columns)
+        else:
+            self._executemany(_SQL_FUSED, list(zip(*columns.values())))
+        _invalidate(self._cache_scope, "fused", session_id)
 
     def insert_state_verdicts(self, session_id: str, project_id: str, verdicts: list[dict]):
-        sql = """
-            INSERT INTO gold_state_verdicts
-                (session_id, project_id, dfa_state,
-                 intended_emotion, actual_emotion,
-                 intended_score_avg, acceptable_min, acceptable_max,
-                 verdict, deviation_score,
-                 actual_duration_sec, expected_duration_sec, time_delta_sec)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
         rows = [
             (
                 session_id, project_id, v["dfa_state"],
@@ -274,87 +498,97 @@ class SnowflakeClient:
             )
             for v in verdicts
         ]
-        self._executemany(sql, rows)
+        self._executemany(_SQL_STATE_VERDICTS, rows)
+        _invalidate(self._cache_scope, "verdicts", session_id)
 
     def insert_session_health(self, session_id: str, project_id: str, health: dict):
-        sql = """
-            INSERT INTO gold_session_health
-                (session_id, project_id, tester_id, health_score,
-                 pass_count, warn_count, fail_count, total_duration_sec)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        self._execute(sql, (
+        self._execute(_SQL_SESSION_HEALTH, (
             session_id, project_id, health.get("tester_id"), health["health_score"],
             health.get("pass_count"), health.get("warn_count"),
             health.get("fail_count"), health.get("total_duration_sec"),
         ))
+        _invalidate(self._cache_scope, "health", session_id)
 
     def refresh_cross_session_aggregates(self, project_id: str):
-        self._execute(
-            "DELETE FROM gold_cross_session_aggregates WHERE project_id = %s",
-            (project_id,),
-        )
         self._execute(
             """
-            INSERT INTO gold_cross_session_aggregates
+            MERGE INTO gold_cross_session_aggregates t
+            USING (
+                SELECT
+                    f.project_id,
+                    f.dfa_state,
+                    COUNT(DISTINCT f.session_id)                    AS num_sessions,
+                    AVG(f.frustration)                              AS avg_frustration,
+                    AVG(f.confusion)                                AS avg_confusion,
+                    AVG(f.delight)                                  AS avg_delight,
+                    AVG(COALESCE(f.watch_hr, f.camera_hr))         AS avg_heart_rate,
+                    AVG(IFF(v.verdict = 'PASS', 1.0, 0.0))        AS pass_rate,
+                    AVG(IFF(v.verdict = 'FAIL', 1.0, 0.0))        AS fail_rate,
+                    AVG(v.time_delta_sec)                           AS avg_time_delta_sec
+                FROM silver_fused_timeline f
+                LEFT JOIN gold_state_verdicts v
+                       ON v.session_id = f.session_id
+                      AND v.dfa_state  = f.dfa_state
+                WHERE f.project_id = %s
+                GROUP BY f.project_id, f.dfa_state
+            ) s
+               ON t.project_id = s.project_id
+              AND t.dfa_state  = s.dfa_state
+            WHEN MATCHED THEN UPDATE SET
+                num_sessions       = s.num_sessions,
+                avg_frustration    = s.avg_frustration,
+                avg_confusion      = s.avg_confusion,
+                avg_delight        = s.avg_delight,
+                avg_heart_rate     = s.avg_heart_rate,
+                pass_rate          = s.pass_rate,
+                fail_rate          = s.fail_rate,
+                avg_time_delta_sec = s.avg_time_delta_sec,
+                computed_at        = CURRENT_TIMESTAMP()
+            WHEN NOT MATCHED THEN INSERT
                 (project_id, dfa_state, num_sessions,
                  avg_frustration, avg_confusion, avg_delight, avg_heart_rate,
                  pass_rate, fail_rate, avg_time_delta_sec)
-            SELECT
-                f.project_id,
-                f.dfa_state,
-                COUNT(DISTINCT f.session_id)                    AS num_sessions,
-                AVG(f.frustration)                              AS avg_frustration,
-                AVG(f.confusion)                                AS avg_confusion,
-                AVG(f.delight)                                  AS avg_delight,
-                AVG(COALESCE(f.watch_hr, f.camera_hr))         AS avg_heart_rate,
-                AVG(IFF(v.verdict = 'PASS', 1.0, 0.0))        AS pass_rate,
-                AVG(IFF(v.verdict = 'FAIL', 1.0, 0.0))        AS fail_rate,
-                AVG(v.time_delta_sec)                           AS avg_time_delta_sec
-            FROM silver_fused_timeline f
-            LEFT JOIN gold_state_verdicts v
-                   ON v.session_id = f.session_id
-                  AND v.dfa_state  = f.dfa_state
-            WHERE f.project_id = %s
-            GROUP BY f.project_id, f.dfa_state
+            VALUES
+                (s.project_id, s.dfa_state, s.num_sessions,
+                 s.avg_frustration, s.avg_confusion, s.avg_delight, s.avg_heart_rate,
+                 s.pass_rate, s.fail_rate, s.avg_time_delta_sec)
             """,
             (project_id,),
         )
+        _invalidate(self._cache_scope, "heatmap", project_id)
 
     def get_session_verdicts(self, session_id: str) -> list[dict]:
-        return self._execute(
+        return _cached_read(self._cache_scope, "verdicts", session_id, lambda: self._execute(
             "SELECT * FROM gold_state_verdicts WHERE session_id = %s ORDER BY computed_at",
             (session_id,),
             fetch=True,
-        )
+        ))
 
     def get_session_health(self, session_id: str) -> Optional[dict]:
-        rows = self._execute(
+        rows = _cached_read(self._cache_scope, "health", session_id, lambda: self._execute(
             "SELECT * FROM gold_session_health WHERE session_id = %s",
             (session_id,),
             fetch=True,
-        )
+        ))
         return rows[0] if rows else None
 
     def get_fused_timeline(self, session_id: str) -> list[dict]:
-        return self._execute(
-            "SELECT * FROM silver_fused_timeline WHERE session_id = %s ORDER BY t_second",
-            (session_id,),
-            fetch=True,
-        )
+        return _cached_read(self._cache_scope, "fused", session_id, lambda: self._execute(
+            _SQL_GET_FUSED, (session_id,), fetch=True,
+        ))
+
+    def get_fused_timeline_iter(self, session_id: str) -> Iterator[dict]:
+        """Streaming variant of get_fused_timeline for long sessions (bypasses the read cache)."""
+        return self._execute_iter(_SQL_GET_FUSED, (session_id,))
 
     def get_cross_session_heatmap(self, project_id: str) -> list[dict]:
-        return self._execute(
-            """
-            SELECT dfa_state, avg_frustration, avg_heart_rate,
-                   pass_rate, fail_rate, num_sessions
-            FROM gold_cross_session_aggregates
-            WHERE project_id = %s
-            ORDER BY avg_frustration DESC
-            """,
-            (project_id,),
-            fetch=True,
-        )
+        return _cached_read(self._cache_scope, "heatmap", project_id, lambda: self._execute(
+            _SQL_GET_HEATMAP, (project_id,), fetch=True,
+        ))
+
+    def get_cross_session_heatmap_iter(self, project_id: str) -> Iterator[dict]:
+        """Streaming variant of get_cross_session_heatmap (bypasses the read cache)."""
+        return self._execute_iter(_SQL_GET_HEATMAP, (project_id,))
 
     def get_time_delta_vs_confusion(self, project_id: str) -> list[dict]:
         return self._execute(